@@ -0,0 +1,74 @@
+"""added revenue rollups
+
+Revision ID: 3b7f2a91c4de
+Revises: e5c1df9b61db
+Create Date: 2026-10-17 09:12:41.208311
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7f2a91c4de"
+down_revision: Union[str, None] = "e5c1df9b61db"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Period key and first day of the period holding the SQL date ``d``; these
+# mirror PERIOD_FORMATS and period_start() in rollups.py.
+PERIODS = {
+    "DAILY": ("%Y-%m-%d", "date({d})"),
+    # "%W" puts the days before the first Monday in week 00, which starts on
+    # January 1st.
+    "WEEKLY": (
+        "%Y-%W",
+        "max(date({d}, '-6 days', 'weekday 1'), strftime('%Y-01-01', {d}))",
+    ),
+    "MONTHLY": ("%Y-%m", "strftime('%Y-%m-01', {d})"),
+    "ANNUAL": ("%Y", "strftime('%Y-01-01', {d})"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "revenue_rollups",
+        sa.Column(
+            "period_type",
+            sa.Enum(
+                "DAILY",
+                "WEEKLY",
+                "MONTHLY",
+                "ANNUAL",
+                name="salesummeryperiod",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("period", sa.String(), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("total_revenue", sa.Float(), nullable=False),
+        sa.Column("sale_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("period_type", "period"),
+    )
+    for period_type, (key_format, start) in PERIODS.items():
+        op.execute(
+            f"INSERT INTO revenue_rollups (period_type, period, period_start, "
+            f"total_revenue, sale_count, created_at, updated_at) "
+            f"SELECT '{period_type}', strftime('{key_format}', sale_date), "
+            f"{start.format(d='min(sale_date)')}, SUM(total_price), COUNT(id), "
+            f"CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+            f"FROM sales WHERE sale_date IS NOT NULL "
+            f"GROUP BY strftime('{key_format}', sale_date)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("revenue_rollups")
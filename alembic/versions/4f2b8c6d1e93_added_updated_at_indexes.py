@@ -0,0 +1,36 @@
+"""added updated_at indexes
+
+Revision ID: 4f2b8c6d1e93
+Revises: c81e5f3d7a09
+Create Date: 2026-10-17 23:31:42.118604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2b8c6d1e93"
+down_revision: Union[str, None] = "c81e5f3d7a09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_categories_updated_at", "categories", ["updated_at"], unique=False
+    )
+    op.create_index("ix_products_updated_at", "products", ["updated_at"], unique=False)
+    op.create_index(
+        "ix_inventory_updated_at", "inventory", ["updated_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_inventory_updated_at", table_name="inventory")
+    op.drop_index("ix_products_updated_at", table_name="products")
+    op.drop_index("ix_categories_updated_at", table_name="categories")
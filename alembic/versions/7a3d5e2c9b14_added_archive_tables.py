@@ -0,0 +1,123 @@
+"""added archive tables
+
+Revision ID: 7a3d5e2c9b14
+Revises: 4f2b8c6d1e93
+Create Date: 2026-10-18 00:12:07.531240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3d5e2c9b14"
+down_revision: Union[str, None] = "4f2b8c6d1e93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps():
+    return [
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "products_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("category_id", sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "inventory_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=True),
+        sa.Column("stock", sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "sales_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("total_price", sa.Float(), nullable=False),
+        sa.Column("sale_date", sa.DateTime(), nullable=True),
+        sa.Column(
+            "channel",
+            sa.Enum(
+                "ONLINE",
+                "RETAIL",
+                "EMAIL",
+                "PHONE",
+                "SOCIAL_MEDIA",
+                "OTHER",
+                name="saleschannel",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("customer_email", sa.String(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_sales_archive_sale_date_id",
+        "sales_archive",
+        ["sale_date", "id"],
+        unique=False,
+    )
+    op.create_table(
+        "inventory_logs_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("inventory_id", sa.Integer(), nullable=False),
+        sa.Column("old_stock", sa.Integer(), nullable=False),
+        sa.Column("new_stock", sa.Integer(), nullable=False),
+        sa.Column(
+            "change_reason",
+            sa.Enum(
+                "MANUAL_ADJUSTMENT",
+                "SALE",
+                "RESTOCK",
+                "RETURN",
+                "DAMAGE",
+                name="changereason",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("change_date", sa.DateTime(), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_inventory_logs_archive_inventory_id_change_date",
+        "inventory_logs_archive",
+        ["inventory_id", "change_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_inventory_logs_archive_inventory_id_change_date",
+        table_name="inventory_logs_archive",
+    )
+    op.drop_table("inventory_logs_archive")
+    op.drop_index("ix_sales_archive_sale_date_id", table_name="sales_archive")
+    op.drop_table("sales_archive")
+    op.drop_table("inventory_archive")
+    op.drop_table("products_archive")
@@ -0,0 +1,51 @@
+"""added dashboard counters
+
+Revision ID: 9d04c6e8a1f2
+Revises: 3b7f2a91c4de
+Create Date: 2026-10-17 11:47:03.554918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d04c6e8a1f2"
+down_revision: Union[str, None] = "3b7f2a91c4de"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTED_TABLES = {
+    "categories": "categories",
+    "products": "products",
+    "inventory_items": "inventory",
+    "sales": "sales",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "counters",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index("ix_sales_sale_date_id", "sales", ["sale_date", "id"], unique=False)
+    for name, table in COUNTED_TABLES.items():
+        op.execute(
+            f"INSERT INTO counters (name, value, created_at, updated_at) "
+            f"SELECT '{name}', COUNT(*), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+            f"FROM {table} WHERE is_deleted = 0"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sales_sale_date_id", table_name="sales")
+    op.drop_table("counters")
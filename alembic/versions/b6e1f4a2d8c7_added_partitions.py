@@ -0,0 +1,59 @@
+"""added partitions
+
+Revision ID: b6e1f4a2d8c7
+Revises: 7a3d5e2c9b14
+Create Date: 2026-10-18 02:41:19.208734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e1f4a2d8c7"
+down_revision: Union[str, None] = "7a3d5e2c9b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "partitions",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("parent", sa.String(), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("period_end", sa.Date(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        "ix_partitions_parent_period_start",
+        "partitions",
+        ["parent", "period_start"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Rows in sealed month tables are moved back into their parent table first,
+    so no data is lost.
+    """
+    connection = op.get_bind()
+    for name, parent in connection.execute(
+        sa.text("SELECT name, parent FROM partitions")
+    ).all():
+        columns = ", ".join(
+            row[1] for row in connection.execute(sa.text(f"PRAGMA table_info({name})"))
+        )
+        op.execute(f"INSERT INTO {parent} ({columns}) SELECT {columns} FROM {name}")
+        op.drop_table(name)
+    op.drop_index("ix_partitions_parent_period_start", table_name="partitions")
+    op.drop_table("partitions")
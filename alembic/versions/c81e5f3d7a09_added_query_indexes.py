@@ -0,0 +1,59 @@
+"""added query indexes
+
+Revision ID: c81e5f3d7a09
+Revises: 9d04c6e8a1f2
+Create Date: 2026-10-17 14:05:19.730162
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81e5f3d7a09"
+down_revision: Union[str, None] = "9d04c6e8a1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_products_category_id", "products", ["category_id"], unique=False
+    )
+    op.create_index(
+        "ix_inventory_product_id", "inventory", ["product_id"], unique=False
+    )
+    op.create_index(
+        "ix_inventory_live_stock",
+        "inventory",
+        ["stock"],
+        unique=False,
+        sqlite_where=sa.text("is_deleted = 0"),
+    )
+    op.create_index(
+        "ix_sales_product_id_sale_date_id",
+        "sales",
+        ["product_id", "sale_date", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_inventory_logs_inventory_id_change_date",
+        "inventory_logs",
+        ["inventory_id", "change_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_inventory_logs_inventory_id_change_date", table_name="inventory_logs"
+    )
+    op.drop_index("ix_sales_product_id_sale_date_id", table_name="sales")
+    op.drop_index("ix_inventory_live_stock", table_name="inventory")
+    op.drop_index("ix_inventory_product_id", table_name="inventory")
+    op.drop_index("ix_products_category_id", table_name="products")
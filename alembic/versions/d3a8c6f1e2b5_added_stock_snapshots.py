@@ -0,0 +1,56 @@
+"""added stock snapshots
+
+Revision ID: d3a8c6f1e2b5
+Revises: b6e1f4a2d8c7
+Create Date: 2026-10-18 04:12:36.517402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8c6f1e2b5"
+down_revision: Union[str, None] = "b6e1f4a2d8c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _sealed_log_tables() -> list[str]:
+    return (
+        op.get_bind()
+        .execute(sa.text("SELECT name FROM partitions WHERE parent = 'inventory_logs'"))
+        .scalars()
+        .all()
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stock_snapshots",
+        sa.Column("snapshot_date", sa.Date(), nullable=False),
+        sa.Column("inventory_id", sa.Integer(), nullable=False),
+        sa.Column("stock", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("snapshot_date", "inventory_id"),
+    )
+    op.create_index(
+        "ix_inventory_logs_change_date",
+        "inventory_logs",
+        ["change_date"],
+        unique=False,
+    )
+    # Sealed months copy their parent's indexes only when they are created.
+    for name in _sealed_log_tables():
+        op.create_index(f"ix_{name}_change_date", name, ["change_date"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in _sealed_log_tables():
+        op.drop_index(f"ix_{name}_change_date", table_name=name)
+    op.drop_index("ix_inventory_logs_change_date", table_name="inventory_logs")
+    op.drop_table("stock_snapshots")
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import Table, delete, exists, func, insert, select, text, union_all
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, aliased
+
+import partitions
+from config import ARCHIVE_CHUNK_SIZE
+from models import (
+    Inventory,
+    InventoryLog,
+    Product,
+    Sale,
+    inventory_archive,
+    inventory_logs_archive,
+    products_archive,
+    sales_archive,
+)
+
+ARCHIVE_TABLES = {
+    InventoryLog: inventory_logs_archive,
+    Sale: sales_archive,
+    Inventory: inventory_archive,
+    Product: products_archive,
+}
+
+
+def source(model, include_archived: bool):
+    """``model``, or an alias of it reading its live and archived rows together."""
+    if not include_archived:
+        return model
+    table = model.__table__
+    archived = ARCHIVE_TABLES[model]
+    rows = union_all(
+        select(table),
+        select(*(archived.c[column.name] for column in table.columns)),
+    ).subquery(f"{table.name}_with_archive")
+    return aliased(model, rows, adapt_on_names=True)
+
+
+def _references(db: Session, model):
+    """Conditions true while a live row still points at a row of ``model``."""
+    if model is Inventory:
+        return [
+            table.c.inventory_id == Inventory.id
+            for table in partitions.tables(db, InventoryLog)
+        ]
+    if model is Product:
+        return [
+            *(
+                table.c.product_id == Product.id
+                for table in partitions.tables(db, Sale)
+            ),
+            Inventory.product_id == Product.id,
+        ]
+    return []
+
+
+def _archivable(db: Session, model, cutoff: datetime):
+    table = model.__table__
+    condition = (model.is_deleted == True) & (model.updated_at < cutoff)
+    for reference in _references(db, model):
+        condition &= ~exists().where(reference)
+    # SQLite hands out MAX(id) + 1, so moving the newest row would let its id
+    # be reused by a live row and collide with the archived copy.
+    return condition & (table.c.id < select(func.max(table.c.id)).scalar_subquery())
+
+
+def _used_bytes(db: Session, table: Table) -> int | None:
+    """Bytes used by ``table`` and its indexes, from the ``dbstat`` table."""
+    try:
+        return db.execute(
+            text(
+                "SELECT SUM(pgsize - unused) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_schema WHERE tbl_name = :table)"
+            ),
+            {"table": table.name},
+        ).scalar()
+    except OperationalError:
+        # dbstat is a compile-time option; without it only row counts are shown.
+        db.rollback()
+        return None
+
+
+def _move(db: Session, model, cutoff: datetime, chunk_size: int) -> int:
+    table = model.__table__
+    archived = ARCHIVE_TABLES[model]
+    columns = [column.name for column in table.columns]
+    condition = _archivable(db, model, cutoff)
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(table.c.id).where(condition).order_by(table.c.id).limit(chunk_size)
+        ).all()
+        if not ids:
+            return moved
+        db.execute(
+            insert(archived).from_select(
+                columns, select(table).where(table.c.id.in_(ids))
+            )
+        )
+        db.execute(delete(table).where(table.c.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+
+
+def archive_deleted(
+    db: Session, older_than: timedelta, chunk_size: int = ARCHIVE_CHUNK_SIZE
+) -> dict:
+    """Move soft-deleted rows last updated before ``older_than`` ago out of the
+    hot tables, ``chunk_size`` rows per transaction.
+
+    Logs and sales go first so that inventory items and products they
+    reference can follow; a deleted row still referenced by a live one stays.
+    Returns, per table, the rows moved and the live-table size before and after.
+    """
+    cutoff = datetime.utcnow() - older_than
+    report = {}
+    for model in ARCHIVE_TABLES:
+        table = model.__table__
+        rows_before = db.scalar(select(func.count()).select_from(table))
+        bytes_before = _used_bytes(db, table)
+        moved = _move(db, model, cutoff, chunk_size)
+        report[table.name] = {
+            "archived": moved,
+            "rows_before": rows_before,
+            "rows_after": rows_before - moved,
+            "deleted_kept": db.scalar(
+                select(func.count()).select_from(table).where(model.is_deleted == True)
+            ),
+            "bytes_before": bytes_before,
+            "bytes_after": _used_bytes(db, table),
+        }
+    db.commit()
+    return report
@@ -0,0 +1,107 @@
+"""Measure how many statements the catalog cache removes from the sale path.
+
+Sends the same stream of sales to POST /sales/{product_id} with the product
+cache disabled and enabled, and reports SQL statements and time per sale.
+
+    python benchmarks/catalog_cache.py --products 100 --sales 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from cache import product_cache
+from database import make_engine
+from enums import SalesChannel
+from main import app, get_db, get_read_db
+from models import Base, Category, Inventory, Product
+
+
+def seed(db, products, stock):
+    category = Category(name="Benchmark")
+    for i in range(products):
+        product = Product(name=f"Product {i}", price=10.0 + i, category=category)
+        db.add_all([product, Inventory(product=product, stock=stock)])
+    db.commit()
+
+
+def run(client, statements, product_ids):
+    statements.clear()
+    started = time.perf_counter()
+    for product_id in product_ids:
+        response = client.post(
+            f"/sales/{product_id}",
+            json={
+                "product_id": product_id,
+                "quantity": 1,
+                "total_price": 0,
+                "channel": SalesChannel.ONLINE.value,
+            },
+        )
+        response.raise_for_status()
+    return time.perf_counter() - started, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--sales", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    product_ids = [rng.randint(1, args.products) for _ in range(args.sales)]
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{os.path.join(directory, 'cache.sqlite3')}")
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with SessionLocal() as db:
+            seed(db, args.products, stock=2 * args.sales)
+
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        max_size = product_cache.max_size
+        try:
+            client = TestClient(app)
+            product_cache.clear()
+            product_cache.max_size = 0
+            uncached = run(client, statements, product_ids)
+            product_cache.max_size = max_size
+            cached = run(client, statements, product_ids)
+        finally:
+            product_cache.max_size = max_size
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    print(f"{args.sales} sales across {args.products} products")
+    for label, (elapsed, count) in (("no cache", uncached), ("cache", cached)):
+        print(
+            f"  {label:>8}: {count / args.sales:.2f} statements/sale, "
+            f"{elapsed * 1000 / args.sales:.2f} ms/sale"
+        )
+    print(f"  cache stats: {product_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
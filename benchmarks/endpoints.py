@@ -0,0 +1,502 @@
+"""Latency and throughput of every API route, checked against a JSON baseline.
+
+Seeds a database with ``--sales`` sales (cached under benchmarks/data/ and
+copied for each run, since the write routes change it), then drives every
+route in main.py through an in-process ASGI client with ``--concurrency``
+requests in flight. p50/p99 latency and requests per second are compared with
+the baseline recorded for the same dataset, request count and concurrency; the
+run fails when a route is slower by more than
+``--tolerance`` at p50 or ``--p99-tolerance`` at p99 (and ``--min-delta-ms``),
+when a request fails, or when a route has no benchmark below.
+
+    python benchmarks/endpoints.py --sales 10000
+    python benchmarks/endpoints.py --sales 1000000 --update-baseline
+    python benchmarks/endpoints.py --sales 10000 --routes "GET /sales/"
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+
+SEED = 42
+SALES_START = datetime(2023, 1, 1)
+SALES_DAYS = 730
+# Daily stock snapshots cover the last days of the sales range.
+SNAPSHOT_DAYS = 30
+BATCH_SIZE = 100
+IMPORT_ROWS = 100
+
+# Routes that never complete a response, so they can't be timed per request.
+SKIPPED = {
+    "GET /inventory/low-stock/stream": "server-sent event stream",
+    "WS /inventory/low-stock/ws": "WebSocket stream",
+}
+
+
+def sale(product_id):
+    return {
+        "product_id": product_id,
+        "quantity": 1,
+        "total_price": 0,
+        "channel": "online",
+    }
+
+
+def day(i):
+    return (SALES_START + timedelta(days=i % SALES_DAYS)).isoformat()
+
+
+def as_of(i):
+    last = SALES_START + timedelta(days=SALES_DAYS - 1)
+    return (
+        last - timedelta(days=i % SNAPSHOT_DAYS) + timedelta(hours=i % 24)
+    ).isoformat()
+
+
+def import_file(i):
+    rows = "".join(
+        f"Imported {i}-{row},9.99,Benchmark import,Bench {row % 5},100\n"
+        for row in range(IMPORT_ROWS)
+    )
+    return ("catalog.csv", "name,price,description,category,stock\n" + rows)
+
+
+# Each route maps to a function of (request number, dataset sizes) returning
+# the URL and the keyword arguments for httpx. Routes run in this order;
+# deletes go last so the other routes never hit a deleted product.
+ROUTES = {
+    "GET /": lambda i, n: ("/", {}),
+    "GET /categories/": lambda i, n: ("/categories/", {}),
+    "GET /categories/{category_id}": lambda i, n: (
+        f"/categories/{1 + i % n['categories']}",
+        {},
+    ),
+    "POST /categories/": lambda i, n: (
+        "/categories/",
+        {"json": {"name": f"Bench {n['run']} {i}"}},
+    ),
+    "GET /products/": lambda i, n: ("/products/", {}),
+    "GET /products/{product_id}": lambda i, n: (
+        f"/products/{1 + i % n['products']}",
+        {},
+    ),
+    "POST /products/": lambda i, n: (
+        "/products/",
+        {"json": {"name": f"Bench {i}", "price": 9.99, "category_id": 1}},
+    ),
+    "POST /products/import/": lambda i, n: (
+        "/products/import/",
+        {"params": {"format": "csv"}, "files": {"file": import_file(i)}},
+    ),
+    "GET /inventory/": lambda i, n: ("/inventory/", {}),
+    "GET /inventory/{inventory_id}": lambda i, n: (
+        f"/inventory/{1 + i % n['products']}",
+        {},
+    ),
+    "GET /inventory/as-of": lambda i, n: (
+        "/inventory/as-of",
+        {"params": {"date": as_of(i)}},
+    ),
+    "POST /inventory/": lambda i, n: (
+        "/inventory/",
+        {"json": {"product_id": 1 + i % n["products"], "stock": 100}},
+    ),
+    "GET /inventory/low-stock/": lambda i, n: (
+        "/inventory/low-stock/",
+        {"params": {"threshold": (5, 50)[i % 2]}},
+    ),
+    "GET /inventory/logs/": lambda i, n: (
+        "/inventory/logs/",
+        {"params": {"inventory_id": 1 + i % n["products"]}},
+    ),
+    "GET /inventory/logs/export/": lambda i, n: (
+        "/inventory/logs/export/",
+        {"params": {"inventory_id": 1 + i % n["products"]}},
+    ),
+    "GET /sales/": lambda i, n: (
+        "/sales/",
+        {
+            "params": (
+                {},
+                {"start_date": day(i), "end_date": day(i + 7)},
+                {"product_id": 1 + i % n["products"]},
+                {"category_id": 1 + i % n["categories"]},
+            )[i % 4]
+        },
+    ),
+    "GET /sales/{sale_id}": lambda i, n: (f"/sales/{1 + i * 7919 % n['sales']}", {}),
+    "GET /sales/summary/": lambda i, n: (
+        "/sales/summary/",
+        {"params": {"period": ("daily", "weekly", "monthly", "annual")[i % 4]}},
+    ),
+    "GET /sales/comparison/": lambda i, n: (
+        "/sales/comparison/",
+        {"params": {"period": ("daily", "weekly", "monthly", "annual")[i % 4]}},
+    ),
+    "GET /sales/export/": lambda i, n: (
+        "/sales/export/",
+        {"params": {"start_date": day(i), "end_date": day(i + 1)}},
+    ),
+    "POST /sales/{product_id}": lambda i, n: (
+        f"/sales/{1 + i % n['products']}",
+        {"json": sale(1 + i % n["products"])},
+    ),
+    "POST /sales/batch": lambda i, n: (
+        "/sales/batch",
+        {
+            "json": [
+                sale(1 + (i * BATCH_SIZE + j) % n["products"])
+                for j in range(BATCH_SIZE)
+            ]
+        },
+    ),
+    "PUT /inventory/{inventory_id}": lambda i, n: (
+        f"/inventory/{1 + i % n['products']}",
+        {"json": {"stock": 1000000 + i, "change_reason": "restock"}},
+    ),
+    "PUT /inventory/": lambda i, n: (
+        "/inventory/",
+        {
+            "json": [
+                {
+                    "inventory_id": 1 + (i * BATCH_SIZE + j) % n["products"],
+                    "stock": 1000000 + j,
+                    "change_reason": "restock",
+                }
+                for j in range(BATCH_SIZE)
+            ]
+        },
+    ),
+    "GET /write-queue/": lambda i, n: ("/write-queue/", {}),
+    "GET /cache/": lambda i, n: ("/cache/", {}),
+    "GET /metrics": lambda i, n: ("/metrics", {}),
+    "DELETE /products/{product_id}": lambda i, n: (
+        f"/products/{n['products'] - i}",
+        {},
+    ),
+}
+
+
+def migrate(url):
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+
+def write_snapshots(url):
+    """Write the stock snapshots the as-of route replays from, if missing."""
+    from sqlalchemy.orm import Session
+
+    from database import make_engine
+    from snapshots import write_missing
+
+    engine = make_engine(url)
+    last = (SALES_START + timedelta(days=SALES_DAYS - 1)).date()
+    with Session(engine) as db:
+        write_missing(db, last, last - timedelta(days=SNAPSHOT_DAYS - 1))
+    engine.dispose()
+
+
+def seed(path, sales, products, categories):
+    """Create a migrated database of generated catalog and sales rows."""
+    from sqlalchemy import update
+    from sqlalchemy.orm import Session
+
+    from counters import reconcile
+    from database import make_engine
+    from models import Inventory
+    from rollups import rebuild
+    from sample_data import generate
+
+    url = f"sqlite:///{path}"
+    migrate(url)
+    engine = make_engine(url)
+    started = time.perf_counter()
+    with Session(engine) as db:
+        generate(
+            db,
+            categories=categories,
+            products=products,
+            sales=sales,
+            logs=sales // 5,
+            seed=SEED,
+            end=(SALES_START + timedelta(days=SALES_DAYS - 1)).date(),
+            days=SALES_DAYS,
+        )
+        # Enough stock that the sale routes never run out, except for some
+        # low-stock items kept clear of the products those routes use.
+        db.execute(update(Inventory).values(stock=10**6))
+        db.execute(
+            update(Inventory)
+            .where(Inventory.id % 20 == 0, Inventory.id > products // 2)
+            .values(stock=Inventory.id % 11)
+        )
+        rebuild(db)
+        reconcile(db)
+        db.commit()
+    engine.dispose()
+    write_snapshots(url)
+    print(f"Seeded {sales} sales in {time.perf_counter() - started:.1f}s: {path}")
+
+
+async def measure(client, route, sizes, requests, concurrency, warmup):
+    method = route.split(" ", 1)[0]
+    latencies, failures = [], []
+    counter = itertools.count()
+
+    async def send(i):
+        url, kwargs = ROUTES[route](i, sizes)
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            failures.append(f"{method} {url}: {response.status_code}")
+        return elapsed
+
+    for _ in range(warmup):
+        await send(next(counter))
+
+    async def worker():
+        while (i := next(counter)) < warmup + requests:
+            latencies.append(await send(i))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3),
+        "requests_per_second": round(len(latencies) / wall, 1),
+        "failures": failures[:5],
+    }
+
+
+async def run_routes(routes, sizes, args):
+    import httpx
+
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+        for route in routes:
+            results[route] = await measure(
+                client, route, sizes, args.requests, args.concurrency, args.warmup
+            )
+            result = results[route]
+            print(
+                f"  {route:<36} p50 {result['p50_ms']:9.2f} ms  "
+                f"p99 {result['p99_ms']:9.2f} ms  "
+                f"{result['requests_per_second']:9.1f} req/s"
+            )
+    return results
+
+
+def regressions(results, baseline, tolerance, p99_tolerance, min_delta_ms):
+    found = []
+    for route, result in results.items():
+        expected = baseline.get(route)
+        if not expected:
+            continue
+        for metric, allowed in (("p50_ms", tolerance), ("p99_ms", p99_tolerance)):
+            limit = max(
+                expected[metric] * (1 + allowed), expected[metric] + min_delta_ms
+            )
+            if result[metric] > limit:
+                found.append(
+                    f"{route}: {metric} {result[metric]} > {expected[metric]} baseline"
+                )
+        floor = expected["requests_per_second"] * (1 - tolerance)
+        if result["requests_per_second"] < floor and (
+            result["p50_ms"] - expected["p50_ms"] > min_delta_ms
+        ):
+            found.append(
+                f"{route}: {result['requests_per_second']} req/s < "
+                f"{expected['requests_per_second']} baseline"
+            )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sales", type=int, default=10000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--routes", nargs="*", help='only these routes, e.g. "GET /sales/"'
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%"
+    )
+    parser.add_argument(
+        "--p99-tolerance",
+        type=float,
+        default=0.5,
+        help="allowed p99 slowdown; tail latency is noisier",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=1.0,
+        help="ignore latency changes smaller than this",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="defaults to baselines/endpoints-<sales>-<products>-<categories>"
+        "-r<requests>-c<concurrency>.json",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="also write this run's results here")
+    args = parser.parse_args()
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    seeded = os.path.join(
+        DATA_DIR, f"sales-{args.sales}-{args.products}-{args.categories}.sqlite3"
+    )
+    requests_needed = args.requests + args.warmup
+    if requests_needed >= args.products:
+        parser.error("--products must exceed --requests + --warmup")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.sqlite3")
+        # Configure the app's engines before anything imports database.py.
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        os.environ.pop("READ_DATABASE_URL", None)
+        if not os.path.exists(seeded):
+            seed(seeded, args.sales, args.products, args.categories)
+        shutil.copyfile(seeded, path)
+        # Seeds are cached across runs; bring older ones up to the head schema.
+        migrate(f"sqlite:///{path}")
+        write_snapshots(f"sqlite:///{path}")
+
+        from fastapi.routing import APIRoute, APIWebSocketRoute
+
+        from main import app
+
+        declared = set()
+        for route in app.routes:
+            if isinstance(route, APIRoute):
+                declared.update(f"{method} {route.path}" for method in route.methods)
+            elif isinstance(route, APIWebSocketRoute):
+                declared.add(f"WS {route.path}")
+        missing = declared - ROUTES.keys() - SKIPPED.keys()
+        if missing:
+            print(f"❌ Routes without a benchmark: {sorted(missing)}")
+            sys.exit(1)
+        for route, reason in SKIPPED.items():
+            if route in declared:
+                print(f"  {route:<36} not benchmarked: {reason}")
+
+        routes = [route for route in ROUTES if route in declared]
+        if args.routes:
+            routes = [route for route in routes if route in args.routes]
+        sizes = {
+            "sales": args.sales,
+            "products": args.products,
+            "categories": args.categories,
+            "run": int(time.time()),
+        }
+        print(
+            f"{args.sales} sales, {args.products} products, {args.requests} requests "
+            f"per route, concurrency {args.concurrency}"
+        )
+        results = asyncio.run(run_routes(routes, sizes, args))
+
+        from database import engine, read_engine
+
+        engine.dispose()
+        read_engine.dispose()
+
+    # Latencies are only comparable between runs with the same settings.
+    settings = {
+        "dataset": {
+            "sales": args.sales,
+            "products": args.products,
+            "categories": args.categories,
+        },
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+    }
+    report = {**settings, "routes": results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    failed = {route: r["failures"] for route, r in results.items() if r["failures"]}
+    if failed:
+        print("❌ Requests failed:")
+        for route, failures in failed.items():
+            print(f"  - {route}: {failures}")
+        sys.exit(1)
+
+    baseline_path = args.baseline or os.path.join(
+        BASELINE_DIR,
+        f"endpoints-{args.sales}-{args.products}-{args.categories}"
+        f"-r{args.requests}-c{args.concurrency}.json",
+    )
+    baseline = None
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        recorded = {key: baseline.get(key) for key in settings}
+
+    if args.update_baseline or baseline is None:
+        os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+        # Keep the routes this run skipped, unless they were measured differently.
+        if baseline is not None and recorded == settings:
+            report["routes"] = {**baseline["routes"], **results}
+        with open(baseline_path, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"✅ Baseline written to {baseline_path}")
+        return
+
+    if recorded != settings:
+        print(f"❌ {baseline_path} was recorded with different settings:")
+        for key, value in settings.items():
+            if recorded[key] != value:
+                print(f"  - {key}: {recorded[key]} in the baseline, {value} now")
+        print("  Pass --update-baseline to re-record it, or choose another --baseline.")
+        sys.exit(1)
+    found = regressions(
+        results,
+        baseline["routes"],
+        args.tolerance,
+        args.p99_tolerance,
+        args.min_delta_ms,
+    )
+    if found:
+        print(f"❌ Regressions against {baseline_path}:")
+        for regression in found:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print(f"✅ No route regressed more than {args.tolerance:.0%} against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
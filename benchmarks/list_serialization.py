@@ -0,0 +1,134 @@
+"""Compare the column-tuple + orjson list path with ORM + response model encoding.
+
+The "orm" path is what the list endpoints did before: load ORM objects with
+their relationships, validate them into the response model and encode the
+result the way FastAPI's JSONResponse does. The "fast" path is the one they
+use now. Both must produce the same JSON.
+
+    python benchmarks/list_serialization.py --rows 50000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from database import make_engine
+from models import Base, Category, Inventory, Product
+from schemas import CategoryRead, InventoryRead, ProductRead
+from serialization import category_rows, inventory_rows, json_response, product_rows
+
+CASES = [
+    ("categories", Category, None, List[CategoryRead], category_rows),
+    (
+        "products",
+        Product,
+        joinedload(Product.category),
+        List[ProductRead],
+        product_rows,
+    ),
+    (
+        "inventory",
+        Inventory,
+        joinedload(Inventory.product).joinedload(Product.category),
+        List[InventoryRead],
+        inventory_rows,
+    ),
+]
+
+
+def seed(db, rows):
+    db.execute(
+        Category.__table__.insert(),
+        [
+            {"name": f"Category {i}", "description": "Benchmark category"}
+            for i in range(rows)
+        ],
+    )
+    db.execute(
+        Product.__table__.insert(),
+        [
+            {
+                "name": f"Product {i}",
+                "price": 10.0 + i % 100,
+                "description": "Benchmark product",
+                "category_id": i + 1,
+            }
+            for i in range(rows)
+        ],
+    )
+    db.execute(
+        Inventory.__table__.insert(),
+        [{"product_id": i + 1, "stock": i % 50} for i in range(rows)],
+    )
+    db.commit()
+
+
+def orm_path(db, model, load, adapter):
+    db.expunge_all()
+    query = db.query(model).filter_by(is_deleted=False).order_by(model.id)
+    if load is not None:
+        query = query.options(load)
+    content = adapter.dump_python(
+        adapter.validate_python(query.all(), from_attributes=True), mode="json"
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def fast_path(db, rows):
+    return json_response(rows(db)).body
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{os.path.join(directory, 'bench.sqlite3')}")
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with SessionLocal() as db:
+            seed(db, args.rows)
+
+        print(f"{args.rows} rows, best of {args.repeat}")
+        for name, model, load, schema, rows in CASES:
+            adapter = TypeAdapter(schema)
+            with SessionLocal() as db:
+                orm_time, orm_body = best_of(
+                    args.repeat, lambda: orm_path(db, model, load, adapter)
+                )
+                fast_time, fast_body = best_of(args.repeat, lambda: fast_path(db, rows))
+            same = json.loads(orm_body) == json.loads(fast_body)
+            print(
+                f"  {name:>10}: orm {orm_time * 1000:8.1f} ms, "
+                f"fast {fast_time * 1000:8.1f} ms, "
+                f"{orm_time / fast_time:4.1f}x, same output: {same}"
+            )
+            if not same:
+                sys.exit(1)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
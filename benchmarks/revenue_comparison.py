@@ -0,0 +1,126 @@
+"""Compare the rollup-backed /sales/comparison/ with the original two-GROUP BY
+implementation and its nested matching loop.
+
+    python benchmarks/revenue_comparison.py --periods 12000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from enums import SaleSummeryPeriod, SalesChannel
+from main import revenue_comparison as revenue_comparison_route
+from models import Base, Sale
+from rollups import rebuild
+
+# The sync handler behind db_endpoint, called directly with a plain Session.
+revenue_comparison = revenue_comparison_route.__wrapped__
+
+
+def legacy_revenue_comparison(db, date_format, delta):
+    current_data = (
+        db.query(
+            func.strftime(date_format, Sale.sale_date).label("period"),
+            func.sum(Sale.total_price).label("total_revenue"),
+        )
+        .group_by("period")
+        .order_by("period")
+        .all()
+    )
+    previous_data = (
+        db.query(
+            func.strftime(
+                date_format, func.date(Sale.sale_date, f"-{delta.days} days")
+            ).label("period"),
+            func.sum(Sale.total_price).label("total_revenue"),
+        )
+        .group_by("period")
+        .order_by("period")
+        .all()
+    )
+    result = []
+    for curr_period, curr_revenue in current_data:
+        prev_revenue = 0
+        for prev in previous_data:
+            if prev[0] == curr_period:
+                prev_revenue = prev[1]
+                break
+        result.append((curr_period, curr_revenue, prev_revenue))
+    return result
+
+
+def seed(db, periods, sales_per_period):
+    start = datetime(2000, 1, 1)
+    db.execute(
+        Sale.__table__.insert(),
+        [
+            {
+                "product_id": 1,
+                "quantity": 1,
+                "total_price": 10.0 + i % 7,
+                "sale_date": start + timedelta(days=i, minutes=j),
+                "channel": SalesChannel.ONLINE,
+                "is_deleted": False,
+            }
+            for i in range(periods)
+            for j in range(sales_per_period)
+        ],
+    )
+    rebuild(db)
+    db.commit()
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--periods", type=int, default=12000)
+    parser.add_argument("--sales-per-period", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    seed(db, args.periods, args.sales_per_period)
+
+    legacy_time, legacy = timed(
+        lambda: legacy_revenue_comparison(db, "%Y-%m-%d", timedelta(days=1))
+    )
+    rollup_time, rollup = timed(
+        lambda: revenue_comparison(
+            period=SaleSummeryPeriod.DAILY.value, start_date=None, end_date=None, db=db
+        )
+    )
+    window_time, window = timed(
+        lambda: revenue_comparison(
+            period=SaleSummeryPeriod.DAILY.value,
+            start_date=datetime(2010, 1, 1).date(),
+            end_date=datetime(2010, 12, 31).date(),
+            db=db,
+        )
+    )
+
+    print(f"daily periods:        {len(legacy)}")
+    print(f"legacy (2 scans, O(n^2) match): {legacy_time * 1000:10.1f} ms")
+    print(f"rollups + dict lookup:          {rollup_time * 1000:10.1f} ms")
+    print(
+        f"rollups, one-year window:       {window_time * 1000:10.1f} ms"
+        f" ({len(window)} periods)"
+    )
+    print(f"speedup: {legacy_time / rollup_time:.1f}x")
+    assert len(rollup) == len(legacy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from config import CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS
+
+
+class LRUCache:
+    """A thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    ``get_or_load`` calls ``loader`` on a miss and caches its result unless it
+    is ``None``, so lookups of missing rows always reach the database.
+    A ``max_size`` of 0 disables caching.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a load that raced one isn't stored.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object]):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        if value is None or self.max_size <= 0:
+            return value
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+# Read models (ProductRead / CategoryRead) of live rows, keyed by id.
+product_cache = LRUCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS)
+category_cache = LRUCache(CATALOG_CACHE_SIZE, CATALOG_CACHE_TTL_SECONDS)
@@ -0,0 +1,115 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Sequence
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+# updated_at is stored with one-second precision, so a version is only final
+# once the second of its latest change has passed.
+TIMESTAMP_RESOLUTION = timedelta(seconds=1)
+
+
+def collection_version(db: Session, models: Sequence) -> tuple[datetime | None, str]:
+    """Return the latest ``updated_at`` and a digest of every table in ``models``.
+
+    Each table contributes ``MAX(updated_at)`` and ``COUNT(*)``, both answered
+    from its ``updated_at`` index, so no rows are loaded.
+    """
+    columns = []
+    for model in models:
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        columns.append(select(func.count()).select_from(model).scalar_subquery())
+    values = db.execute(select(*columns)).one()
+    last_modified = max((value for value in values[::2] if value), default=None)
+    digest = hashlib.sha1(repr(tuple(values)).encode()).hexdigest()[:20]
+    return last_modified, digest
+
+
+def item_version(instances: Sequence) -> tuple[datetime | None, str]:
+    """Return the latest ``updated_at`` and a digest of ``instances``, the rows
+    (or read models) one detail response is built from; None entries, such as
+    a missing category, count too."""
+    values = tuple(
+        None if instance is None else (instance.id, instance.updated_at)
+        for instance in instances
+    )
+    last_modified = max(
+        (value[1] for value in values if value and value[1]), default=None
+    )
+    digest = hashlib.sha1(repr(values).encode()).hexdigest()[:20]
+    return last_modified, digest
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def _not_modified_since(header: str, last_modified: datetime | None) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def conditional_get(
+    request: Request, response: Response, db: Session, name: str, models: Sequence
+) -> Response | None:
+    """Add ETag / Last-Modified headers for a collection read from ``models``.
+
+    Returns a 304 response when the request's validators still match, in which
+    case the caller must not load anything. ``If-None-Match`` takes precedence
+    over ``If-Modified-Since``.
+    """
+    return _evaluate(request, response, name, *collection_version(db, models))
+
+
+def conditional_get_item(
+    request: Request, response: Response, name: str, *instances
+) -> Response | None:
+    """``conditional_get`` for a detail response built from ``instances``,
+    which are already loaded, so no query is run."""
+    return _evaluate(request, response, name, *item_version(instances))
+
+
+def _evaluate(
+    request: Request,
+    response: Response,
+    name: str,
+    last_modified: datetime | None,
+    digest: str,
+) -> Response | None:
+    if last_modified and datetime.utcnow() < last_modified + TIMESTAMP_RESOLUTION:
+        # Another write in the same second would keep the same validators.
+        return None
+
+    etag = f'"{name}-{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since is not None:
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,67 @@
+import os
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Serve requests through the aiosqlite engine instead of the sync threadpool.
+USE_ASYNC_DB = env_flag("USE_ASYNC_DB")
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./db.sqlite3")
+# GET handlers read through their own read-only pool; point this at a replica
+# to move reporting off the primary entirely.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", DATABASE_URL)
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "10"))
+
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Coalesce writes from concurrent requests into one transaction per batch.
+GROUP_COMMIT = env_flag("GROUP_COMMIT")
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "256"))
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", "5"))
+
+# Stock level at or below which an item is reported and pushed as low stock.
+LOW_STOCK_THRESHOLD = int(os.getenv("LOW_STOCK_THRESHOLD", "5"))
+# Seconds between keep-alive messages on the low-stock push feeds.
+LOW_STOCK_HEARTBEAT_SECONDS = float(os.getenv("LOW_STOCK_HEARTBEAT_SECONDS", "15"))
+# Age after which the low-stock index is reloaded in full, picking up stock
+# changed by other worker processes and scripts.
+LOW_STOCK_RELOAD_SECONDS = float(os.getenv("LOW_STOCK_RELOAD_SECONDS", "30"))
+
+# Entries kept per catalog read cache (products, categories); 0 disables them.
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "10000"))
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+
+# Log SQL statements slower than this, with their route and parameters; 0 = off.
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+# Development aid: report SQL statements repeated within one request (likely
+# N+1 loads) and raise when a route runs more statements than its query budget.
+QUERY_DEBUG = env_flag("QUERY_DEBUG")
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+
+# Soft-deleted rows untouched for this long are moved to the archive tables.
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "5000"))
+
+# Sales and inventory logs stay in their tables for the current month and the
+# PARTITION_HOT_MONTHS - 1 before it; older months are sealed into one table
+# per month. Sealed months older than PARTITION_RETENTION_MONTHS are dropped
+# whole; 0 keeps them forever.
+PARTITION_HOT_MONTHS = int(os.getenv("PARTITION_HOT_MONTHS", "2"))
+PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))
+PARTITION_CHUNK_SIZE = int(os.getenv("PARTITION_CHUNK_SIZE", "5000"))
+
+# Checkpoint every inventory item's stock at each UTC midnight from a background
+# task, so stock as of any moment replays at most a day of inventory logs.
+STOCK_SNAPSHOT_JOB = env_flag("STOCK_SNAPSHOT_JOB", True)
+# Checkpoints older than this many days are deleted; 0 keeps them forever.
+STOCK_SNAPSHOT_RETENTION_DAYS = int(os.getenv("STOCK_SNAPSHOT_RETENTION_DAYS", "0"))
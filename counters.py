@@ -0,0 +1,48 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+import partitions
+from enums import DashboardCounter
+from models import Category, Counter, Inventory, Product, Sale
+
+COUNTED_MODELS = {
+    DashboardCounter.CATEGORIES: Category,
+    DashboardCounter.PRODUCTS: Product,
+    DashboardCounter.INVENTORY_ITEMS: Inventory,
+    DashboardCounter.SALES: Sale,
+}
+
+
+def increment(db: Session, counter: DashboardCounter, delta: int = 1):
+    stmt = insert(Counter).values(name=counter.value, value=delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Counter.name],
+        set_={"value": Counter.value + stmt.excluded.value, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+
+
+def read_all(db: Session) -> dict:
+    values = dict(db.query(Counter.name, Counter.value).all())
+    return {counter.value: values.get(counter.value, 0) for counter in DashboardCounter}
+
+
+def reconcile(db: Session) -> dict:
+    """Reset every counter to the number of live rows it tracks."""
+    for counter, model in COUNTED_MODELS.items():
+        count = sum(
+            db.scalar(
+                select(func.count())
+                .select_from(table)
+                .where(table.c.is_deleted == False)
+            )
+            for table in partitions.tables(db, model)
+        )
+        stmt = insert(Counter).values(name=counter.value, value=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Counter.name],
+            set_={"value": stmt.excluded.value, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+    return read_all(db)
@@ -1,11 +1,125 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./db.sqlite3"
-
-engine = create_engine(
+from config import (
     DATABASE_URL,
-    connect_args={"check_same_thread": False},  # required for SQLite
+    READ_DATABASE_URL,
+    READ_POOL_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
 )
 
+
+def sqlite_pragmas(read_only: bool = False) -> dict:
+    pragmas = {
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+        "mmap_size": SQLITE_MMAP_SIZE,
+    }
+    if read_only:
+        pragmas["query_only"] = "ON"
+    else:
+        pragmas["journal_mode"] = SQLITE_JOURNAL_MODE
+        pragmas["synchronous"] = SQLITE_SYNCHRONOUS
+    return pragmas
+
+
+def _listen_for_pragmas(engine, read_only: bool):
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def _begin_immediate(engine):
+    # pysqlite defers BEGIN until the first write and never wraps SAVEPOINTs;
+    # take over transaction control so a writer holds the lock from the start.
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def _begin_read(engine):
+    # Without a transaction every SELECT sees the latest commit, so a request
+    # could list a month's partitions and then read them after a seal moved
+    # rows out of the listed tables. A deferred BEGIN pins one WAL snapshot for
+    # the session; it goes through the DBAPI cursor so the query budgets don't
+    # count it.
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_read(connection):
+        cursor = connection.connection.cursor()
+        cursor.execute("BEGIN")
+        cursor.close()
+
+
+def _engine_options(url: str, read_only: bool) -> dict:
+    options = {}
+    if read_only and make_url(url).database not in (None, "", ":memory:"):
+        options["pool_size"] = READ_POOL_SIZE
+    return options
+
+
+def make_engine(
+    url: str = DATABASE_URL,
+    read_only: bool = False,
+    begin_immediate: bool = False,
+    **kwargs,
+):
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+    engine = create_engine(url, **_engine_options(url, read_only), **kwargs)
+    if is_sqlite:
+        _listen_for_pragmas(engine, read_only)
+        if begin_immediate:
+            _begin_immediate(engine)
+        elif read_only:
+            _begin_read(engine)
+    return engine
+
+
+def make_async_engine(url: str = DATABASE_URL, read_only: bool = False, **kwargs):
+    async_url = make_url(url)
+    is_sqlite = async_url.get_backend_name() == "sqlite"
+    if is_sqlite:
+        async_url = async_url.set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(async_url, **_engine_options(url, read_only), **kwargs)
+    if is_sqlite:
+        _listen_for_pragmas(engine.sync_engine, read_only)
+        if read_only:
+            _begin_read(engine.sync_engine)
+    return engine
+
+
+engine = make_engine(DATABASE_URL)
+read_engine = make_engine(READ_DATABASE_URL, read_only=True)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = make_async_engine(DATABASE_URL)
+async_read_engine = make_async_engine(READ_DATABASE_URL, read_only=True)
+
+AsyncSessionLocal = async_sessionmaker(
+    autocommit=False, autoflush=False, bind=async_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    autocommit=False, autoflush=False, bind=async_read_engine
+)
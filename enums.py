@@ -43,3 +43,33 @@ class ChangeReason(str, enum.Enum):
     RESTOCK = "restock"
     RETURN = "return"
     DAMAGE = "damage"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class DashboardCounter(str, enum.Enum):
+    CATEGORIES = "categories"
+    PRODUCTS = "products"
+    INVENTORY_ITEMS = "inventory_items"
+    SALES = "sales"
+
+
+class BatchItemStatus(str, enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    REJECTED = "rejected"
+
+
+class ImportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class LowStockEvent(str, enum.Enum):
+    SNAPSHOT = "snapshot"
+    LOW_STOCK = "low_stock"
+    RESTOCKED = "restocked"
+    HEARTBEAT = "heartbeat"
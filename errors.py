@@ -8,3 +8,12 @@ class ErrorMessages:
     INVALID_PRODUCT_ID = "Invalid product ID"
     CATEGORY_NOT_FOUND = "Category not found"
     STOCK_CANNOT_BE_NEGATIVE = "Stock cannot be negative"
+    INVALID_CURSOR = "Invalid pagination cursor"
+    NO_STOCK_SNAPSHOT = "No stock snapshot at or before this date"
+    INVALID_QUANTITY = "Quantity must be at least 1"
+    BATCH_TOO_LARGE = "Batch exceeds the maximum number of items"
+    BATCH_CONFLICT = "Batch conflicted with concurrent writes, retry it"
+    IMPORT_MISSING_NAME = "Missing product name"
+    IMPORT_INVALID_PRICE = "Price must be a non-negative number"
+    IMPORT_INVALID_STOCK = "Stock must be a non-negative integer"
+    IMPORT_INVALID_RECORD = "Record could not be parsed"
@@ -0,0 +1,153 @@
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from config import GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_DELAY_MS
+
+
+class BatchSession(Session):
+    """Session handed to each queued write.
+
+    Writes run inside a SAVEPOINT of the shared batch transaction. ``commit()``
+    releases the savepoint and ``rollback()`` undoes it, each opening a fresh
+    one, so handlers keep their commit/retry logic unchanged while the real
+    COMMIT is left to the writer.
+    """
+
+    def commit(self):
+        self.get_nested_transaction().commit()
+        self.begin_nested()
+
+    def rollback(self):
+        self.get_nested_transaction().rollback()
+        self.begin_nested()
+
+
+class GroupCommitWriter:
+    """Run queued writes on one thread and commit them in batches.
+
+    A batch closes when it holds ``max_batch`` writes or ``max_delay`` seconds
+    after its first write arrived, whichever comes first. A failing write is
+    rolled back to its savepoint without affecting the rest of the batch; if
+    the final COMMIT fails, every write in the batch fails with it.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_batch: int = GROUP_COMMIT_MAX_BATCH,
+        max_delay: float = GROUP_COMMIT_MAX_DELAY_MS / 1000,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+        self.failed_commits = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="group-commit", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def submit(self, work: Callable[[Session], object]) -> Future:
+        """Queue ``work(session)``; the future resolves once its batch commits.
+
+        ``work`` runs in a copy of the caller's context, like the threadpool.
+        """
+        self.start()
+        future = Future()
+        self._queue.put((contextvars.copy_context(), work, future))
+        return future
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "writes": self.writes,
+            "failed_commits": self.failed_commits,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "average_batch_size": (
+                round(self.writes / self.batches, 2) if self.batches else 0
+            ),
+        }
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            self._write(batch)
+
+    def _write(self, batch: list):
+        results = []
+        with self.session_factory() as db:
+            try:
+                for context, work, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    db.begin_nested()
+                    try:
+                        result = context.run(work, db)
+                        db.flush()
+                    except BaseException as exc:
+                        db.get_nested_transaction().rollback()
+                        future.set_exception(exc)
+                        continue
+                    db.get_nested_transaction().commit()
+                    results.append((future, result))
+                Session.commit(db)
+            except BaseException as exc:
+                self.failed_commits += 1
+                Session.rollback(db)
+                for future, _ in results:
+                    future.set_exception(exc)
+                results = []
+
+        self.batches += 1
+        self.writes += len(batch)
+        self.last_batch_size = len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        for future, result in results:
+            future.set_result(result)
@@ -0,0 +1,177 @@
+import csv
+import json
+import math
+import time
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import counters
+from enums import DashboardCounter, ImportFormat
+from errors import ErrorMessages
+from models import Category, Inventory, Product
+
+IMPORT_CHUNK_SIZE = 5000
+# Stock given to imported products without a "stock" column, like create_product.
+DEFAULT_IMPORT_STOCK = 1
+MAX_REPORTED_ERRORS = 100
+
+
+def iter_records(stream: IO[str], import_format: ImportFormat) -> Iterator[dict]:
+    if import_format == ImportFormat.CSV:
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise TypeError
+    return value
+
+
+def _parse(record) -> tuple[dict | None, str | None]:
+    if not isinstance(record, dict):
+        return None, ErrorMessages.IMPORT_INVALID_RECORD
+    # NDJSON values can be any JSON type; CSV ones are always strings.
+    try:
+        name = (_text(record.get("name")) or "").strip()
+        category = (_text(record.get("category")) or "").strip() or None
+        description = _text(record.get("description")) or None
+    except TypeError:
+        return None, ErrorMessages.IMPORT_INVALID_RECORD
+    if not name:
+        return None, ErrorMessages.IMPORT_MISSING_NAME
+    price = record.get("price")
+    try:
+        if isinstance(price, bool):
+            raise TypeError
+        price = float(price)
+        if not math.isfinite(price) or price < 0:
+            raise ValueError
+    except (TypeError, ValueError):
+        return None, ErrorMessages.IMPORT_INVALID_PRICE
+    stock = record.get("stock")
+    try:
+        if isinstance(stock, bool):
+            raise TypeError
+        stock = DEFAULT_IMPORT_STOCK if stock in (None, "") else int(stock)
+        if stock < 0:
+            raise ValueError
+    except (TypeError, ValueError, OverflowError):
+        return None, ErrorMessages.IMPORT_INVALID_STOCK
+    return {
+        "name": name,
+        "price": price,
+        "description": description,
+        "category": category,
+        "stock": stock,
+    }, None
+
+
+class CatalogImporter:
+    """Bulk-load products, their categories and initial inventory.
+
+    Category names are resolved through a map loaded once up front; names not
+    seen before are created with the chunk that first uses them. Each chunk is
+    written and committed as one transaction.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.category_ids = dict(db.query(Category.name, Category.id))
+        self.rows = 0
+        self.imported = 0
+        self.categories_created = 0
+        self.errors = []
+        self.rejected = 0
+
+    def _resolve_categories(self, products: list[dict]):
+        missing = {
+            product["category"]
+            for product in products
+            if product["category"] and product["category"] not in self.category_ids
+        }
+        if not missing:
+            return
+        created = self.db.execute(
+            insert(Category).returning(Category.name, Category.id),
+            [{"name": name} for name in sorted(missing)],
+        )
+        self.category_ids.update(created.tuples().all())
+        self.categories_created += len(missing)
+        counters.increment(self.db, DashboardCounter.CATEGORIES, len(missing))
+
+    def _write_chunk(self, products: list[dict]):
+        self._resolve_categories(products)
+        product_ids = self.db.execute(
+            insert(Product).returning(Product.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": product["name"],
+                    "price": product["price"],
+                    "description": product["description"],
+                    "category_id": self.category_ids.get(product["category"]),
+                }
+                for product in products
+            ],
+        ).scalars()
+        self.db.execute(
+            insert(Inventory),
+            [
+                {"product_id": product_id, "stock": product["stock"]}
+                for product_id, product in zip(product_ids, products)
+            ],
+        )
+        counters.increment(self.db, DashboardCounter.PRODUCTS, len(products))
+        counters.increment(self.db, DashboardCounter.INVENTORY_ITEMS, len(products))
+        self.db.commit()
+        self.imported += len(products)
+
+    def run(self, records: Iterable) -> dict:
+        started = time.perf_counter()
+        records = iter(records)
+        while chunk := list(islice(records, self.chunk_size)):
+            products = []
+            for record in chunk:
+                self.rows += 1
+                product, error = _parse(record)
+                if error:
+                    self.rejected += 1
+                    if len(self.errors) < MAX_REPORTED_ERRORS:
+                        self.errors.append(f"row {self.rows}: {error}")
+                    continue
+                products.append(product)
+            if products:
+                self._write_chunk(products)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "rows": self.rows,
+            "imported": self.imported,
+            "rejected": self.rejected,
+            "categories_created": self.categories_created,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed) if elapsed else self.rows,
+            "errors": self.errors,
+        }
+
+
+def import_catalog(
+    db: Session,
+    stream: IO[str],
+    import_format: ImportFormat,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    return CatalogImporter(db, chunk_size).run(iter_records(stream, import_format))
@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session, sessionmaker
+
+from config import LOW_STOCK_RELOAD_SECONDS, LOW_STOCK_THRESHOLD
+from database import SessionLocal
+from enums import LowStockEvent
+from models import Inventory, Product
+
+PENDING_KEY = "low_stock_changes"
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def mark_inventory(db: Session, inventory_ids: Iterable[int]):
+    """Have the index re-read these inventory items once ``db`` commits."""
+    db.info.setdefault(PENDING_KEY, (set(), set()))[0].update(inventory_ids)
+
+
+def mark_products(db: Session, product_ids: Iterable[int]):
+    """Have the index re-read the inventory of these products once ``db`` commits."""
+    db.info.setdefault(PENDING_KEY, (set(), set()))[1].update(product_ids)
+
+
+class LowStockIndex:
+    """The live inventory items at or below ``threshold``, kept per process.
+
+    Write handlers mark the items they touch on their session; after the
+    outermost commit only those items are re-read, and subscribers are told
+    when one crosses the threshold in either direction. The full set is loaded
+    on first read and again once it is ``max_age`` seconds old, which picks up
+    changes made by other processes; ``reset()`` drops it right away.
+
+    Database reads never run on an event loop thread: there they are handed to
+    the index's own thread, and a stale index answers ``None`` meanwhile.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        threshold: int = LOW_STOCK_THRESHOLD,
+        max_age: float = LOW_STOCK_RELOAD_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.threshold = threshold
+        self.max_age = max_age
+        self._items = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="low-stock-index"
+        )
+
+    def _query(self, db: Session):
+        return (
+            db.query(Inventory.id, Inventory.product_id, Inventory.stock, Product.name)
+            .join(Product, Inventory.product_id == Product.id)
+            .filter(Inventory.is_deleted == False, Product.is_deleted == False)
+        )
+
+    @staticmethod
+    def _item(row) -> dict:
+        return {
+            "id": row.id,
+            "product_id": row.product_id,
+            "stock": row.stock,
+            "product_name": row.name,
+        }
+
+    def _stale(self) -> bool:
+        return self._items is None or time.monotonic() - self._loaded_at >= self.max_age
+
+    def _load(self) -> list:
+        with self.session_factory() as db:
+            rows = self._query(db).filter(Inventory.stock <= self.threshold).all()
+        items = {row.id: self._item(row) for row in rows}
+        events = []
+        if self._items is not None:
+            events.extend(
+                (LowStockEvent.LOW_STOCK, item)
+                for inventory_id, item in items.items()
+                if inventory_id not in self._items
+            )
+            events.extend(
+                (LowStockEvent.RESTOCKED, item)
+                for inventory_id, item in self._items.items()
+                if inventory_id not in items
+            )
+        self._items, self._loaded_at = items, time.monotonic()
+        return events
+
+    def reload_if_stale(self):
+        with self._lock:
+            events = self._load() if self._stale() else []
+        for kind, item in events:
+            self.publish(kind, item)
+
+    def items(self, threshold: int | None = None) -> list[dict] | None:
+        """The indexed items at or below ``threshold``, or None when the index
+        is stale and this runs on an event loop; it reloads in the background."""
+        if _on_event_loop() and self._stale():
+            self._worker.submit(self.reload_if_stale)
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            events = self._load() if self._stale() else []
+            items = [
+                dict(item)
+                for item in self._items.values()
+                if item["stock"] <= threshold
+            ]
+        for kind, item in events:
+            self.publish(kind, item)
+        return items
+
+    def reset(self):
+        with self._lock:
+            self._items = None
+
+    def refresh(self, inventory_ids: set, product_ids: set):
+        events = []
+        with self._lock:
+            if self._items is None:
+                return
+            candidates = set(inventory_ids)
+            candidates.update(
+                item["id"]
+                for item in self._items.values()
+                if item["product_id"] in product_ids
+            )
+            with self.session_factory() as db:
+                rows = (
+                    self._query(db)
+                    .filter(
+                        or_(
+                            Inventory.id.in_(candidates),
+                            Inventory.product_id.in_(product_ids),
+                        )
+                    )
+                    .all()
+                )
+            live = {row.id: self._item(row) for row in rows}
+            for inventory_id in candidates | live.keys():
+                item = live.get(inventory_id)
+                was_low = inventory_id in self._items
+                if item and item["stock"] <= self.threshold:
+                    self._items[inventory_id] = item
+                    if not was_low:
+                        events.append((LowStockEvent.LOW_STOCK, item))
+                elif was_low:
+                    removed = self._items.pop(inventory_id)
+                    events.append((LowStockEvent.RESTOCKED, item or removed))
+        for kind, item in events:
+            self.publish(kind, item)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers = {
+            subscriber for subscriber in self._subscribers if subscriber[1] is not queue
+        }
+
+    def publish(self, kind: LowStockEvent, item: dict):
+        message = {"event": kind.value, "threshold": self.threshold, "item": item}
+        for loop, queue in list(self._subscribers):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down.
+                self.unsubscribe(queue)
+
+
+low_stock_index = LowStockIndex()
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_commit(db: Session):
+    # Releasing a SAVEPOINT fires after_commit too; wait for the real COMMIT.
+    if db.in_nested_transaction():
+        return
+    pending = db.info.pop(PENDING_KEY, None)
+    if pending:
+        # Under USE_ASYNC_DB the commit runs on the event loop thread.
+        if _on_event_loop():
+            low_stock_index._worker.submit(low_stock_index.refresh, *pending)
+        else:
+            low_stock_index.refresh(*pending)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_after_rollback(db: Session, transaction):
+    if transaction.parent is None:
+        db.info.pop(PENDING_KEY, None)
@@ -1,24 +1,86 @@
+import asyncio
+import io
+from contextlib import asynccontextmanager
+from functools import wraps
 from typing import List
-from fastapi import FastAPI
-from sqlalchemy import func
-from database import SessionLocal
-from sqlalchemy.orm import Session
+from fastapi import (
+    FastAPI,
+    Query,
+    Request,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import and_, bindparam, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import (
+    GROUP_COMMIT,
+    LOW_STOCK_HEARTBEAT_SECONDS,
+    LOW_STOCK_THRESHOLD,
+    STOCK_SNAPSHOT_JOB,
+    USE_ASYNC_DB,
+)
+from database import (
+    AsyncReadSessionLocal,
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+    make_engine,
+)
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import Depends, status
-from datetime import datetime, timedelta
+from datetime import date, datetime, timezone
 
 from enums import (
+    BatchItemStatus,
     ChangeReason,
+    DashboardCounter,
+    ExportFormat,
+    ImportFormat,
     InventoryStatus,
-    Quantity,
+    LowStockEvent,
     SaleSummeryPeriod,
-    SalesChannel,
 )
+import archive
+import counters
+import metrics
+import partitions
+import snapshots
+from cache import category_cache, product_cache
+from conditional import conditional_get, conditional_get_item
 from errors import ErrorMessages
-from models import Category, InventoryLog, Product, Inventory, Sale
+from group_commit import BatchSession, GroupCommitWriter
+from importer import import_catalog
+from low_stock import low_stock_index, mark_inventory, mark_products
+from models import (
+    Category,
+    InventoryLog,
+    Product,
+    Inventory,
+    RevenueRollup,
+    Sale,
+)
+from pagination import decode_cursor, encode_cursor
+from rollups import (
+    period_key,
+    period_start,
+    previous_period_start,
+    record_sale,
+    record_sales,
+    resolve_period,
+)
 from fastapi import HTTPException
 from schemas import (
+    CatalogImportRead,
     CategoryCreate,
     CategoryRead,
+    InventoryBulkUpdate,
+    InventoryAsOfRead,
+    InventoryBulkUpdateRead,
     InventoryUpdate,
     InventoryUpdateRead,
     LowStockRead,
@@ -27,279 +89,741 @@ from schemas import (
     InventoryCreate,
     InventoryRead,
     RevenueComparisonRead,
+    SaleBatchItemRead,
     SaleCreate,
     SaleRead,
 )
+from serialization import (
+    INVENTORY_LOG_COLUMNS,
+    category_rows,
+    inventory_rows,
+    json_response,
+    product_rows,
+)
+from streaming import dumps, export_response, json_array
+
+# With GROUP_COMMIT, sale and inventory writes are queued and committed in
+# batches by a single writer thread instead of one transaction per request.
+write_queue = (
+    GroupCommitWriter(
+        sessionmaker(
+            class_=BatchSession,
+            autocommit=False,
+            autoflush=False,
+            bind=make_engine(begin_immediate=True),
+        )
+    )
+    if GROUP_COMMIT
+    else None
+)
 
-app = FastAPI()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    snapshot_job = (
+        asyncio.create_task(snapshots.run_daily()) if STOCK_SNAPSHOT_JOB else None
+    )
+    yield
+    if snapshot_job is not None:
+        snapshot_job.cancel()
+    if write_queue is not None:
+        await run_in_threadpool(write_queue.stop)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(metrics.MetricsMiddleware)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+SALE_BATCH_MAX_ITEMS = 10000
+SALE_BATCH_RETRIES = 3
+INVENTORY_BULK_CHUNK_SIZE = 5000
+INVENTORY_BULK_RETRIES = 3
+
+# Eager loads for the relationships nested in the read schemas, so list
+# endpoints don't issue one lazy SELECT per row.
+PRODUCT_LOAD = joinedload(Product.category)
+INVENTORY_LOAD = joinedload(Inventory.product).joinedload(Product.category)
+SALE_LOAD = joinedload(Sale.product).joinedload(Product.category)
+
+
+def _session_dependency(session_factory, async_session_factory):
+    async def get_session():
+        if USE_ASYNC_DB:
+            async with async_session_factory() as db:
+                yield db
+        else:
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+    return get_session
+
+
+get_db = _session_dependency(SessionLocal, AsyncSessionLocal)
+# GET handlers use the read-only pool so reporting never holds the writer.
+get_read_db = _session_dependency(ReadSessionLocal, AsyncReadSessionLocal)
+
+
+_response_adapters = {}
+
+
+def _validate_response(endpoint, content):
+    if endpoint not in _response_adapters:
+        route = next(r for r in app.routes if getattr(r, "endpoint", None) is endpoint)
+        _response_adapters[endpoint] = (
+            TypeAdapter(route.response_model) if route.response_model else None
+        )
+    adapter = _response_adapters[endpoint]
+    if adapter is None or isinstance(content, Response):
+        return content
+    return adapter.validate_python(content, from_attributes=True)
+
+
+def db_endpoint(handler=None, *, group_commit=False, query_budget=None):
+    """Serve a handler written against a sync ``Session`` from an async route.
+
+    With the sync engine the handler runs in the threadpool. With
+    ``USE_ASYNC_DB`` it runs through ``AsyncSession.run_sync``, and the response
+    model is validated there too so no lazy load happens outside the greenlet.
+    Handlers marked ``group_commit`` go through ``write_queue`` when it is on;
+    leave bulk handlers unmarked, since a queued write holds the writer's
+    transaction, and so every other queued write, until it returns.
+    ``query_budget`` caps the SQL statements one request may run, including
+    serializing its response; see ``metrics.MetricsMiddleware``.
+    """
+    if handler is None:
+        return lambda handler: db_endpoint(
+            handler, group_commit=group_commit, query_budget=query_budget
+        )
+
+    @wraps(handler)
+    async def endpoint(*args, db, **kwargs):
+        def call(session):
+            content = handler(*args, db=session, **kwargs)
+            return _validate_response(endpoint, content)
+
+        if group_commit and write_queue is not None:
+            return await asyncio.wrap_future(write_queue.submit(call))
+        if isinstance(db, AsyncSession):
+            return await db.run_sync(call)
+        return await run_in_threadpool(handler, *args, db=db, **kwargs)
+
+    endpoint.query_budget = query_budget
+    return endpoint
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """``value`` as the naive UTC datetime the tables store."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _sources(db: Session, model, include_archived: bool, start=None, end=None):
+    """Tables holding ``model``'s rows dated between ``start`` and ``end``."""
+    tables = partitions.tables(db, model, start, end)
+    if include_archived:
+        tables.append(archive.ARCHIVE_TABLES[model])
+    return tables
 
 
 @app.get("/")
-def dashboard(db: Session = Depends(get_db)):
-    total_categories = db.query(Category).count()
-    total_products = db.query(Product).count()
-    total_inventory_items = db.query(Inventory).count()
-    total_sales = db.query(Sale).count()
-
-    latest_sales = db.query(Sale).order_by(Sale.sale_date.desc()).limit(5).all()
-    latest_sales_data = [
-        {
-            "id": sale.id,
-            "product_id": sale.product_id,
-            "quantity": sale.quantity,
-            "total_price": sale.total_price,
-            "channel": sale.channel,
-            "sale_date": sale.sale_date,
-        }
-        for sale in latest_sales
-    ]
+@db_endpoint(query_budget=3)
+def dashboard(db: Session = Depends(get_read_db)):
+    def latest(sales):
+        return select(
+            sales.id,
+            sales.product_id,
+            sales.quantity,
+            sales.total_price,
+            sales.channel,
+            sales.sale_date,
+        )
+
+    statement = partitions.union(partitions.tables(db, Sale), latest)
+    columns = statement.selected_columns
+    latest_sales = db.execute(
+        statement.order_by(columns.sale_date.desc(), columns.id.desc()).limit(5)
+    ).all()
 
     return {
         "message": "Welcome to the Inventory Management System",
-        "summary": {
-            "categories": total_categories,
-            "products": total_products,
-            "inventory_items": total_inventory_items,
-            "sales": total_sales,
-        },
-        "latest_sales": latest_sales_data,
+        "summary": counters.read_all(db),
+        "latest_sales": [sale._asdict() for sale in latest_sales],
     }
 
 
 @app.post("/categories/", response_model=CategoryRead)
+@db_endpoint(query_budget=4)
 def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     db_category = Category(**category.dict())
     db.add(db_category)
+    counters.increment(db, DashboardCounter.CATEGORIES)
     db.commit()
+    category_cache.invalidate(db_category.id)
     db.refresh(db_category)
     return db_category
 
 
 @app.get("/categories/", response_model=List[CategoryRead])
-def get_categories(db: Session = Depends(get_db)):
-    return db.query(Category).filter_by(is_deleted=False).all()
+@db_endpoint(query_budget=2)
+def get_categories(
+    request: Request, response: Response, db: Session = Depends(get_read_db)
+):
+    not_modified = conditional_get(request, response, db, "categories", [Category])
+    if not_modified:
+        return not_modified
+    return json_response(category_rows(db), headers=response.headers)
 
 
-@app.get("/categories/{category_id}", response_model=CategoryRead)
-def get_category(category_id: int, db: Session = Depends(get_db)):
+def _load_category(db: Session, category_id: int):
     category = db.query(Category).get(category_id)
     if not category or category.is_deleted:
+        return None
+    return CategoryRead.model_validate(category)
+
+
+@app.get("/categories/{category_id}", response_model=CategoryRead)
+@db_endpoint(query_budget=1)
+def get_category(
+    category_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
+    category = category_cache.get_or_load(
+        category_id, lambda: _load_category(db, category_id)
+    )
+    if not category:
         raise HTTPException(status_code=404, detail=ErrorMessages.CATEGORY_NOT_FOUND)
-    return category
+    return conditional_get_item(request, response, "category", category) or category
 
 
 @app.post("/products/", response_model=ProductRead)
+@db_endpoint(query_budget=8)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     db_product = Product(**product.dict())
     db.add(db_product)
+    counters.increment(db, DashboardCounter.PRODUCTS)
     db.commit()
     db.refresh(db_product)
 
     db_inventory = Inventory(product_id=db_product.id, stock=1)
     db.add(db_inventory)
+    counters.increment(db, DashboardCounter.INVENTORY_ITEMS)
+    db.flush()
+    mark_inventory(db, [db_inventory.id])
     db.commit()
+    product_cache.invalidate(db_product.id)
 
     return db_product
 
 
+@app.post("/products/import/", response_model=CatalogImportRead)
+@db_endpoint
+def import_products(
+    file: UploadFile,
+    format: ImportFormat = ImportFormat.CSV,
+    db: Session = Depends(get_db),
+):
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return import_catalog(db, stream, format)
+    finally:
+        low_stock_index.reset()
+        product_cache.clear()
+        category_cache.clear()
+
+
 @app.get("/products/", response_model=List[ProductRead])
-def get_products(db: Session = Depends(get_db)):
-    return db.query(Product).filter_by(is_deleted=False).all()
+@db_endpoint(query_budget=2)
+def get_products(
+    request: Request, response: Response, db: Session = Depends(get_read_db)
+):
+    not_modified = conditional_get(
+        request, response, db, "products", [Product, Category]
+    )
+    if not_modified:
+        return not_modified
+    return json_response(product_rows(db), headers=response.headers)
 
 
-@app.get("/products/{product_id}", response_model=ProductRead)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).get(product_id)
+def _load_product(db: Session, product_id: int):
+    product = db.query(Product).options(PRODUCT_LOAD).get(product_id)
     if not product or product.is_deleted:
+        return None
+    return ProductRead.model_validate(product)
+
+
+@app.get("/products/{product_id}", response_model=ProductRead)
+@db_endpoint(query_budget=1)
+def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
+    product = product_cache.get_or_load(
+        product_id, lambda: _load_product(db, product_id)
+    )
+    if not product:
         raise HTTPException(status_code=404, detail=ErrorMessages.PRODUCT_NOT_FOUND)
-    return product
+    not_modified = conditional_get_item(
+        request, response, "product", product, product.category
+    )
+    return not_modified or product
 
 
 @app.delete("/products/{product_id}")
+@db_endpoint(query_budget=4)
 def delete_product(product_id: int, db: Session = Depends(get_db)):
     product = db.query(Product).get(product_id)
     if not product or product.is_deleted:
         raise HTTPException(status_code=404, detail=ErrorMessages.PRODUCT_NOT_FOUND)
     product.is_deleted = True
+    counters.increment(db, DashboardCounter.PRODUCTS, -1)
+    mark_products(db, [product.id])
     db.commit()
+    product_cache.invalidate(product_id)
     return {"message": ErrorMessages.PRODUCT_SOFT_DELETED}
 
 
 @app.post("/inventory/", response_model=InventoryRead)
+@db_endpoint(query_budget=5)
 def create_inventory(inventory: InventoryCreate, db: Session = Depends(get_db)):
     db_inventory = Inventory(**inventory.dict())
     db.add(db_inventory)
+    counters.increment(db, DashboardCounter.INVENTORY_ITEMS)
+    db.flush()
+    mark_inventory(db, [db_inventory.id])
     db.commit()
     db.refresh(db_inventory)
     return db_inventory
 
 
 @app.get("/inventory/", response_model=List[InventoryRead])
-def get_inventory(db: Session = Depends(get_db)):
-    return db.query(Inventory).filter_by(is_deleted=False).all()
+@db_endpoint(query_budget=2)
+def get_inventory(
+    request: Request, response: Response, db: Session = Depends(get_read_db)
+):
+    not_modified = conditional_get(
+        request, response, db, "inventory", [Inventory, Product, Category]
+    )
+    if not_modified:
+        return not_modified
+    return json_response(inventory_rows(db), headers=response.headers)
+
+
+@app.get("/inventory/as-of", response_model=InventoryAsOfRead)
+@db_endpoint(query_budget=6)
+def get_inventory_as_of(
+    as_of: datetime = Query(alias="date"), db: Session = Depends(get_read_db)
+):
+    result = snapshots.stock_as_of(db, as_of)
+    if result is None:
+        raise HTTPException(status_code=404, detail=ErrorMessages.NO_STOCK_SNAPSHOT)
+    snapshot_date, items = result
+    return json_response(
+        {"as_of": as_of, "snapshot_date": snapshot_date, "items": items}
+    )
 
 
 @app.get("/inventory/{inventory_id}", response_model=InventoryRead)
-def get_inventory_item(inventory_id: int, db: Session = Depends(get_db)):
-    inventory = db.query(Inventory).get(inventory_id)
+@db_endpoint(query_budget=1)
+def get_inventory_item(
+    inventory_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+):
+    inventory = db.query(Inventory).options(INVENTORY_LOAD).get(inventory_id)
     if not inventory or inventory.is_deleted:
         raise HTTPException(status_code=404, detail=ErrorMessages.INVENTORY_NOT_FOUND)
-    return inventory
+    product = inventory.product
+    not_modified = conditional_get_item(
+        request,
+        response,
+        "inventory-item",
+        inventory,
+        product,
+        product and product.category,
+    )
+    return not_modified or inventory
+
+
+def _plan_sales_batch(sales: List[SaleCreate], db: Session):
+    product_ids = {sale.product_id for sale in sales}
+    stock_by_product = {}
+    for product_id, price, inventory_id, stock in (
+        db.query(Product.id, Product.price, Inventory.id, Inventory.stock)
+        .outerjoin(
+            Inventory,
+            and_(Inventory.product_id == Product.id, Inventory.is_deleted == False),
+        )
+        .filter(Product.id.in_(product_ids), Product.is_deleted == False)
+        .order_by(Inventory.id)
+    ):
+        stock_by_product.setdefault(product_id, (price, inventory_id, stock))
+
+    sale_date = datetime.utcnow()
+    results, new_sales, logs = [], [], []
+    read_stock, remaining = {}, {}
+    for index, sale in enumerate(sales):
+        result = {"index": index, "product_id": sale.product_id}
+        results.append(result)
+        if sale.quantity < 1:
+            error = ErrorMessages.INVALID_QUANTITY
+        elif sale.product_id not in stock_by_product:
+            error = ErrorMessages.PRODUCT_NOT_FOUND
+        else:
+            price, inventory_id, stock = stock_by_product[sale.product_id]
+            available = remaining.get(inventory_id, stock or 0)
+            error = (
+                InventoryStatus.OUT_OF_STOCK.value
+                if inventory_id is None or available < sale.quantity
+                else None
+            )
+        if error:
+            result.update(status=BatchItemStatus.REJECTED, error=error)
+            continue
+
+        result["status"] = BatchItemStatus.CREATED
+        read_stock.setdefault(inventory_id, stock)
+        remaining[inventory_id] = available - sale.quantity
+        logs.append(
+            {
+                "inventory_id": inventory_id,
+                "old_stock": available,
+                "new_stock": available - sale.quantity,
+                "change_reason": ChangeReason.SALE,
+                "change_date": sale_date,
+            }
+        )
+        new_sales.append(
+            {
+                "product_id": sale.product_id,
+                "quantity": sale.quantity,
+                "total_price": price * sale.quantity,
+                "sale_date": sale_date,
+                "channel": sale.channel,
+                "customer_email": sale.customer_email,
+            }
+        )
+
+    decrements = [
+        {
+            "sold_inventory_id": inventory_id,
+            "read_stock": stock,
+            "sold_quantity": (stock or 0) - remaining[inventory_id],
+        }
+        for inventory_id, stock in read_stock.items()
+    ]
+    return results, new_sales, logs, decrements
+
+
+@app.post("/sales/batch", response_model=List[SaleBatchItemRead])
+@db_endpoint
+def create_sales_batch(sales: List[SaleCreate], db: Session = Depends(get_db)):
+    if len(sales) > SALE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=422, detail=ErrorMessages.BATCH_TOO_LARGE)
+
+    decrement_stock = (
+        update(Inventory)
+        .where(
+            Inventory.id == bindparam("sold_inventory_id"),
+            Inventory.stock.is_not_distinct_from(bindparam("read_stock")),
+        )
+        .values(stock=Inventory.stock - bindparam("sold_quantity"))
+    )
+    for _ in range(SALE_BATCH_RETRIES):
+        results, new_sales, logs, decrements = _plan_sales_batch(sales, db)
+        if not decrements:
+            return results
+        updated = db.connection().execute(decrement_stock, decrements).rowcount
+        if updated == len(decrements):
+            break
+        # Another sale changed a stock level after it was read; plan again.
+        db.rollback()
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=ErrorMessages.BATCH_CONFLICT
+        )
+
+    sale_ids = iter(
+        db.execute(
+            insert(Sale).returning(Sale.id, sort_by_parameter_order=True), new_sales
+        ).scalars()
+    )
+    db.execute(insert(InventoryLog), logs)
+    record_sales(db, [(sale["sale_date"], sale["total_price"]) for sale in new_sales])
+    counters.increment(db, DashboardCounter.SALES, len(new_sales))
+    mark_inventory(db, [change["sold_inventory_id"] for change in decrements])
+    db.commit()
+
+    for result in results:
+        if result["status"] == BatchItemStatus.CREATED:
+            result["sale_id"] = next(sale_ids)
+    return results
 
 
 @app.post("/sales/{product_id}", response_model=SaleRead)
+@db_endpoint(group_commit=True, query_budget=11)
 def create_sale(product_id: int, sale: SaleCreate, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = product_cache.get_or_load(
+        product_id, lambda: _load_product(db, product_id)
+    )
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ErrorMessages.PRODUCT_NOT_FOUND,
         )
 
-    if product.inventory.stock >= Quantity.ONE.value:
-        (product.inventory.stock - Quantity.ONE.value)
-    else:
+    if sale.quantity < 1:
+        raise HTTPException(status_code=422, detail=ErrorMessages.INVALID_QUANTITY)
+
+    # Check and decrement in one statement so concurrent sales can't both
+    # pass the stock check and oversell. Like /sales/batch, a product sells
+    # from its first live inventory row.
+    inventory_id = (
+        select(Inventory.id)
+        .where(Inventory.product_id == product.id, Inventory.is_deleted == False)
+        .order_by(Inventory.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    sold_from = db.execute(
+        update(Inventory)
+        .where(Inventory.id == inventory_id, Inventory.stock >= sale.quantity)
+        .values(stock=Inventory.stock - sale.quantity)
+        .returning(Inventory.id, Inventory.stock)
+    ).first()
+    if not sold_from:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=InventoryStatus.OUT_OF_STOCK.value,
         )
 
+    sale_date = datetime.utcnow()
+    db.add(
+        InventoryLog(
+            inventory_id=sold_from.id,
+            old_stock=sold_from.stock + sale.quantity,
+            new_stock=sold_from.stock,
+            change_reason=ChangeReason.SALE,
+            change_date=sale_date,
+        )
+    )
+
     db_sale = Sale(
         product_id=product.id,
-        quantity=Quantity.ONE.value,
-        total_price=product.price,
-        sale_date=datetime.utcnow(),
-        channel=SalesChannel.OTHER.value,
-        customer_email=None,
+        quantity=sale.quantity,
+        total_price=product.price * sale.quantity,
+        sale_date=sale_date,
+        channel=sale.channel,
+        customer_email=sale.customer_email,
     )
 
     db.add(db_sale)
+    record_sale(db, db_sale.sale_date, db_sale.total_price)
+    counters.increment(db, DashboardCounter.SALES)
+    mark_inventory(db, [sold_from.id])
     db.commit()
     db.refresh(db_sale)
 
-    return db_sale
+    # The product comes from the cache, so don't lazy-load it again.
+    return {
+        **{column.key: getattr(db_sale, column.key) for column in Sale.__table__.c},
+        "product": product,
+    }
 
 
 @app.get("/sales/")
+@db_endpoint(query_budget=2)
 def get_sales(
     start_date: datetime = None,
     end_date: datetime = None,
     category_id: int = None,
     product_id: int = None,
-    db: Session = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str = None,
+    stream: bool = False,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Sale)
+    cursor = None
+    if after:
+        sale_date, sale_id = decode_cursor(after)
+        cursor = _naive_utc(sale_date), sale_id
+    start_date, end_date = _naive_utc(start_date), _naive_utc(end_date)
+    products = archive.source(Product, include_archived)
 
-    if start_date:
-        query = query.filter(Sale.sale_date >= start_date)
-    if end_date:
-        query = query.filter(Sale.sale_date <= end_date)
-    if product_id:
-        query = query.filter(Sale.product_id == product_id)
-    if category_id:
-        query = query.join(Sale.product).filter(Product.category_id == category_id)
+    def build(sales):
+        query = select(
+            sales.id,
+            sales.product_id,
+            sales.quantity,
+            sales.total_price,
+            sales.sale_date,
+            sales.channel,
+        )
+        if start_date:
+            query = query.where(sales.sale_date >= start_date)
+        if end_date:
+            query = query.where(sales.sale_date <= end_date)
+        if product_id:
+            query = query.where(sales.product_id == product_id)
+        if category_id:
+            query = query.join(products, sales.product_id == products.id).where(
+                products.category_id == category_id
+            )
+        if cursor:
+            query = query.where(tuple_(sales.sale_date, sales.id) > cursor)
+        return query
+
+    # Months before the cursor are already paged through, so skip them too.
+    earliest = max(filter(None, (start_date, cursor and cursor[0])), default=None)
+    tables = _sources(db, Sale, include_archived, earliest, end_date)
+    statement = partitions.union(tables, build)
+    columns = statement.selected_columns
+    statement = statement.order_by(columns.sale_date, columns.id)
+
+    if stream:
+        return StreamingResponse(json_array(statement), media_type="application/json")
+
+    rows = db.execute(statement.limit(limit + 1)).all()
+    items = [row._asdict() for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last["sale_date"], last["id"])
+
+    return json_response({"items": items, "next_cursor": next_cursor})
 
-    results = query.all()
-    return [
-        {
-            "id": sale.id,
-            "product_id": sale.product_id,
-            "quantity": sale.quantity,
-            "total_price": sale.total_price,
-            "sale_date": sale.sale_date,
-            "channel": sale.channel,
-        }
-        for sale in results
-    ]
+
+@app.get("/sales/export/")
+@db_endpoint(query_budget=2)
+def export_sales(
+    format: ExportFormat = ExportFormat.NDJSON,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+):
+    def build(sales):
+        query = select(
+            sales.id,
+            sales.product_id,
+            sales.quantity,
+            sales.total_price,
+            sales.sale_date,
+            sales.channel,
+            sales.customer_email,
+        )
+        if start_date:
+            query = query.where(sales.sale_date >= start_date)
+        if end_date:
+            query = query.where(sales.sale_date <= end_date)
+        return query
+
+    tables = _sources(db, Sale, include_archived, start_date, end_date)
+    statement = partitions.union(tables, build)
+    return export_response(
+        statement.order_by(statement.selected_columns.id), format, "sales"
+    )
 
 
 @app.get("/sales/summary/")
+@db_endpoint(query_budget=1)
 def revenue_summary(
     period: str = SaleSummeryPeriod.WEEKLY.value,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    format_map = {
-        SaleSummeryPeriod.DAILY.value: "%Y-%m-%d",
-        SaleSummeryPeriod.WEEKLY.value: "%Y-%W",
-        SaleSummeryPeriod.MONTHLY.value: "%Y-%m",
-        SaleSummeryPeriod.ANNUAL.value: "%Y",
-    }
-    date_format = format_map.get(period, "%Y-%m-%d")
+    period_type = resolve_period(period, SaleSummeryPeriod.DAILY)
 
     data = (
-        db.query(
-            func.strftime(date_format, Sale.sale_date).label("period"),
-            func.sum(Sale.total_price),
-        )
-        .group_by("period")
-        .order_by("period")
+        db.query(RevenueRollup.period, RevenueRollup.total_revenue)
+        .filter(RevenueRollup.period_type == period_type)
+        .order_by(RevenueRollup.period)
         .all()
     )
 
     return [{"period": d[0], "total_revenue": d[1]} for d in data]
 
 
+def _sealed_sale(db: Session, sale_id: int):
+    """Look ``sale_id`` up in the sealed months of the sales table."""
+    sealed = partitions.tables(db, Sale)[1:]
+    if not sealed:
+        return None
+    row = (
+        db.execute(
+            partitions.union(
+                sealed, lambda sales: select(*sales).where(sales.id == sale_id)
+            )
+        )
+        .mappings()
+        .first()
+    )
+    if row is None:
+        return None
+    # A detached copy: sealed rows aren't in the table the Sale mapper loads.
+    sale = Sale(**row)
+    set_committed_value(
+        sale,
+        "product",
+        db.query(Product).options(joinedload(Product.category)).get(row["product_id"]),
+    )
+    return sale
+
+
 @app.get("/sales/{sale_id}", response_model=SaleRead)
-def get_sale(sale_id: int, db: Session = Depends(get_db)):
-    sale = db.query(Sale).get(sale_id)
+@db_endpoint(query_budget=4)
+def get_sale(sale_id: int, db: Session = Depends(get_read_db)):
+    sale = db.query(Sale).options(SALE_LOAD).get(sale_id) or _sealed_sale(db, sale_id)
     if not sale or sale.is_deleted:
         raise HTTPException(status_code=404, detail=ErrorMessages.SALE_NOT_FOUND)
-    return sale 
+    return sale
 
-@app.get(
-        "/sales/comparison/", response_model=List[RevenueComparisonRead]
-    )
+
+@app.get("/sales/comparison/", response_model=List[RevenueComparisonRead])
+@db_endpoint(query_budget=1)
 def revenue_comparison(
-    period: str = SaleSummeryPeriod.WEEKLY.value, db: Session = Depends(get_db)
+    period: str = SaleSummeryPeriod.WEEKLY.value,
+    start_date: date = None,
+    end_date: date = None,
+    db: Session = Depends(get_read_db),
 ):
-    format_map = {
-        SaleSummeryPeriod.DAILY.value: ("%Y-%m-%d", timedelta(days=1)),
-        SaleSummeryPeriod.WEEKLY.value: ("%Y-%W", timedelta(weeks=1)),
-        SaleSummeryPeriod.MONTHLY.value: ("%Y-%m", timedelta(days=30)),
-        SaleSummeryPeriod.ANNUAL.value: ("%Y", timedelta(days=365)),
-    }
-    date_format, delta = format_map.get(period, ("%Y-%W", timedelta(weeks=1)))
+    period_type = resolve_period(period, SaleSummeryPeriod.WEEKLY)
 
-    current_data = (
-        db.query(
-            func.strftime(date_format, Sale.sale_date).label("period"),
-            func.sum(Sale.total_price).label("total_revenue"),
+    query = db.query(
+        RevenueRollup.period,
+        RevenueRollup.period_start,
+        RevenueRollup.total_revenue,
+    ).filter(RevenueRollup.period_type == period_type)
+    if start_date:
+        first_start = period_start(period_type, start_date)
+        # Also fetch the period before the window so it can be compared.
+        query = query.filter(
+            RevenueRollup.period_start
+            >= previous_period_start(period_type, first_start)
         )
-        .group_by("period")
-        .order_by("period")
-        .all()
-    )
+    if end_date:
+        query = query.filter(RevenueRollup.period_start <= end_date)
 
-    previous_data = (
-        db.query(
-            func.strftime(
-                date_format, func.date(Sale.sale_date, f"-{delta.days} days")
-            ).label("period"),
-            func.sum(Sale.total_price).label("total_revenue"),
-        )
-        .group_by("period")
-        .order_by("period")
-        .all()
-    )
+    rows = query.order_by(RevenueRollup.period_start).all()
+    revenue_by_period = {row.period: row.total_revenue for row in rows}
 
     result = []
-    for curr in current_data:
-        curr_period, curr_revenue = curr
-        prev_revenue = 0
-        prev_period = curr_period
-        for prev in previous_data:
-            if prev[0] == curr_period:
-                prev_revenue = prev[1]
-                prev_period = prev[0]
-                break
+    for curr_period, curr_start, curr_revenue in rows:
+        if start_date and curr_start < first_start:
+            continue
+        prev_period = period_key(
+            period_type, previous_period_start(period_type, curr_start)
+        )
+        prev_revenue = revenue_by_period.get(prev_period, 0)
         percentage_change = (
             ((curr_revenue - prev_revenue) / prev_revenue * 100)
             if prev_revenue > 0
@@ -319,9 +843,18 @@ def revenue_comparison(
 
 
 @app.get("/inventory/low-stock/", response_model=List[LowStockRead])
-def get_low_stock(threshold: int = 5, db: Session = Depends(get_db)):
+@db_endpoint(query_budget=1)
+def get_low_stock(
+    threshold: int = LOW_STOCK_THRESHOLD, db: Session = Depends(get_read_db)
+):
+    # Thresholds up to the configured one are a subset of the maintained index.
+    if threshold <= low_stock_index.threshold:
+        items = low_stock_index.items(threshold)
+        if items is not None:
+            return items
+
     low_stock_items = (
-        db.query(Inventory)
+        db.query(Inventory.id, Inventory.product_id, Inventory.stock, Product.name)
         .join(Product, Inventory.product_id == Product.id)
         .filter(
             Inventory.stock <= threshold,
@@ -335,13 +868,154 @@ def get_low_stock(threshold: int = 5, db: Session = Depends(get_db)):
             "id": item.id,
             "product_id": item.product_id,
             "stock": item.stock,
-            "product_name": item.product.name,
+            "product_name": item.name,
         }
         for item in low_stock_items
     ]
 
 
+async def _low_stock_feed():
+    """Yield a snapshot of the low-stock items, then every threshold crossing,
+    with a heartbeat whenever nothing happened for a while."""
+    queue = low_stock_index.subscribe()
+    try:
+        items = await run_in_threadpool(low_stock_index.items)
+        yield {
+            "event": LowStockEvent.SNAPSHOT.value,
+            "threshold": low_stock_index.threshold,
+            "items": items,
+        }
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), LOW_STOCK_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                await run_in_threadpool(low_stock_index.reload_if_stale)
+                yield {"event": LowStockEvent.HEARTBEAT.value}
+    finally:
+        low_stock_index.unsubscribe(queue)
+
+
+@app.get("/inventory/low-stock/stream")
+async def stream_low_stock():
+    async def events():
+        async for message in _low_stock_feed():
+            yield f"event: {message['event']}\ndata: {dumps(message)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.websocket("/inventory/low-stock/ws")
+async def low_stock_websocket(websocket: WebSocket):
+    await websocket.accept()
+    feed = _low_stock_feed()
+    try:
+        async for message in feed:
+            await websocket.send_text(dumps(message))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await feed.aclose()
+
+
+def _plan_inventory_chunk(chunk: List[InventoryBulkUpdate], offset: int, db: Session):
+    current = dict(
+        db.query(Inventory.id, Inventory.stock).filter(
+            Inventory.id.in_({item.inventory_id for item in chunk}),
+            Inventory.is_deleted == False,
+        )
+    )
+    read_stock = dict(current)
+    change_date = datetime.utcnow()
+    results, logs, touched = [], [], {}
+    for index, item in enumerate(chunk, start=offset):
+        result = {"index": index, "inventory_id": item.inventory_id}
+        results.append(result)
+        if item.inventory_id not in current:
+            error = ErrorMessages.INVENTORY_NOT_FOUND
+        elif item.stock < 0:
+            error = ErrorMessages.STOCK_CANNOT_BE_NEGATIVE
+        else:
+            error = None
+        if error:
+            result.update(status=BatchItemStatus.REJECTED, error=error)
+            continue
+
+        old_stock = current[item.inventory_id]
+        result.update(
+            status=BatchItemStatus.UPDATED, old_stock=old_stock, new_stock=item.stock
+        )
+        logs.append(
+            {
+                "inventory_id": item.inventory_id,
+                "old_stock": old_stock,
+                "new_stock": item.stock,
+                "change_reason": item.change_reason,
+                "change_date": change_date,
+            }
+        )
+        current[item.inventory_id] = touched[item.inventory_id] = item.stock
+
+    changes = [
+        {
+            "updated_inventory_id": inventory_id,
+            "read_stock": read_stock[inventory_id],
+            "new_stock": stock,
+        }
+        for inventory_id, stock in touched.items()
+    ]
+    return results, logs, changes
+
+
+def _apply_inventory_chunk(chunk: List[InventoryBulkUpdate], offset: int, db: Session):
+    set_stock = (
+        update(Inventory)
+        .where(
+            Inventory.id == bindparam("updated_inventory_id"),
+            Inventory.stock.is_not_distinct_from(bindparam("read_stock")),
+        )
+        .values(stock=bindparam("new_stock"))
+    )
+    for _ in range(INVENTORY_BULK_RETRIES):
+        results, logs, changes = _plan_inventory_chunk(chunk, offset, db)
+        if not changes:
+            return results
+        if db.connection().execute(set_stock, changes).rowcount == len(changes):
+            db.execute(insert(InventoryLog), logs)
+            mark_inventory(db, [change["updated_inventory_id"] for change in changes])
+            db.commit()
+            return results
+        # A sale or another adjustment moved a stock level after it was read.
+        db.rollback()
+
+    return [
+        {
+            "index": index,
+            "inventory_id": item.inventory_id,
+            "status": BatchItemStatus.REJECTED,
+            "error": ErrorMessages.BATCH_CONFLICT,
+        }
+        for index, item in enumerate(chunk, start=offset)
+    ]
+
+
+@app.put("/inventory/", response_model=List[InventoryBulkUpdateRead])
+@db_endpoint
+def bulk_update_inventory(
+    updates: List[InventoryBulkUpdate], db: Session = Depends(get_db)
+):
+    results = []
+    for offset in range(0, len(updates), INVENTORY_BULK_CHUNK_SIZE):
+        chunk = updates[offset : offset + INVENTORY_BULK_CHUNK_SIZE]
+        results.extend(_apply_inventory_chunk(chunk, offset, db))
+    return results
+
+
 @app.put("/inventory/{inventory_id}", response_model=InventoryUpdateRead)
+@db_endpoint(group_commit=True, query_budget=8)
 def update_inventory(
     inventory_id: int, update: InventoryUpdate, db: Session = Depends(get_db)
 ):
@@ -376,26 +1050,91 @@ def update_inventory(
     db.add(log)
 
     inventory.stock = update.stock
+    mark_inventory(db, [inventory.id])
     db.commit()
     db.refresh(inventory)
 
     return inventory
 
 
+def _inventory_log_query(inventory_id, start_date, end_date):
+    def build(logs):
+        query = select(*(getattr(logs, column.key) for column in INVENTORY_LOG_COLUMNS))
+        if inventory_id:
+            query = query.where(logs.inventory_id == inventory_id)
+        if start_date:
+            query = query.where(logs.change_date >= start_date)
+        if end_date:
+            query = query.where(logs.change_date <= end_date)
+        return query
+
+    return build
+
+
 @app.get("/inventory/logs/", response_model=List[dict])
-def get_inventory_logs(inventory_id: int = None, db: Session = Depends(get_db)):
-    query = db.query(InventoryLog)
-    if inventory_id:
-        query = query.filter(InventoryLog.inventory_id == inventory_id)
-    logs = query.all()
-    return [
-        {
-            "id": log.id,
-            "inventory_id": log.inventory_id,
-            "old_stock": log.old_stock,
-            "new_stock": log.new_stock,
-            "change_reason": log.change_reason,
-            "change_date": log.change_date,
-        }
-        for log in logs
-    ]
+@db_endpoint(query_budget=2)
+def get_inventory_logs(
+    inventory_id: int = None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+):
+    tables = _sources(db, InventoryLog, include_archived, start_date, end_date)
+    statement = partitions.union(
+        tables, _inventory_log_query(inventory_id, start_date, end_date)
+    )
+    logs = db.execute(statement.order_by(statement.selected_columns.id))
+    return json_response([log._asdict() for log in logs])
+
+
+@app.get("/inventory/logs/export/")
+@db_endpoint(query_budget=2)
+def export_inventory_logs(
+    format: ExportFormat = ExportFormat.NDJSON,
+    inventory_id: int = None,
+    start_date: datetime = None,
+    end_date: datetime = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+):
+    tables = _sources(db, InventoryLog, include_archived, start_date, end_date)
+    statement = partitions.union(
+        tables, _inventory_log_query(inventory_id, start_date, end_date)
+    )
+    return export_response(
+        statement.order_by(statement.selected_columns.id), format, "inventory_logs"
+    )
+
+
+@app.get("/write-queue/")
+def write_queue_stats():
+    if write_queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_queue.stats()}
+
+
+@app.get("/cache/")
+def cache_stats():
+    return {"products": product_cache.stats(), "categories": category_cache.stats()}
+
+
+metrics.StatsCollector(
+    "catalog_cache",
+    "Catalog read cache",
+    cache_stats,
+    label="cache",
+    counters=("hits", "misses", "evictions", "expirations", "invalidations"),
+)
+if write_queue is not None:
+    metrics.StatsCollector(
+        "write_queue",
+        "Group commit write queue",
+        lambda: {None: write_queue.stats()},
+        counters=("batches", "writes", "failed_commits"),
+    )
+
+
+@app.get("/metrics")
+def get_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,371 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from config import QUERY_DEBUG, QUERY_REPEAT_THRESHOLD, SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+# executemany batches can hold thousands of rows; log only the first few.
+MAX_LOGGED_PARAMETER_SETS = 5
+UNMATCHED_ROUTE = "unmatched"
+# Label for statements run outside a request, e.g. by scripts.
+NO_ROUTE = "none"
+
+_registry = []
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A route ran more SQL statements than its declared ``query_budget``."""
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+
+class CounterMetric(_Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = self._header()
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: tuple, labels: tuple = ()
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels):
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(
+                (labels, (list(buckets), total, count))
+                for labels, (buckets, total, count) in self._values.items()
+            )
+        lines = self._header()
+        names = (*self.labels, "le")
+        for labels, (buckets, total, count) in values:
+            cumulative = 0
+            for bound, observed in zip(self.buckets, buckets):
+                cumulative += observed
+                bucket_labels = _format_labels(names, (*labels, bound))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            bucket_labels = _format_labels(names, (*labels, "+Inf"))
+            lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            label_text = _format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class StatsCollector(_Metric):
+    """Export the numeric fields of ``stats()`` dicts as metrics.
+
+    ``collect`` returns a mapping of label value to stats dict. Fields named in
+    ``counters`` become ``<prefix>_<field>_total`` counters, the rest gauges.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        documentation: str,
+        collect: Callable[[], dict],
+        label: str | None = None,
+        counters: tuple = (),
+    ):
+        super().__init__(prefix, documentation, (label,) if label else ())
+        self.collect = collect
+        self.counters = counters
+
+    def render(self) -> list[str]:
+        samples = {}
+        for label_value, stats in self.collect().items():
+            labels = _format_labels(self.labels, (label_value,))
+            for field, value in stats.items():
+                if isinstance(value, (int, float)):
+                    samples.setdefault(field, []).append(f"{labels} {float(value)}")
+        lines = []
+        for field, values in samples.items():
+            is_counter = field in self.counters
+            name = f"{self.name}_{field}" + ("_total" if is_counter else "")
+            lines.append(f"# HELP {name} {self.documentation}: {field}")
+            lines.append(f"# TYPE {name} {'counter' if is_counter else 'gauge'}")
+            lines.extend(name + value for value in values)
+        return lines
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+requests_total = CounterMetric(
+    "http_requests_total", "HTTP requests served", ("method", "route", "status")
+)
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+request_statements = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed while serving a request",
+    STATEMENT_BUCKETS,
+    ("method", "route"),
+)
+request_sql_duration = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL while serving a request",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+statement_duration = Histogram(
+    "db_statement_duration_seconds",
+    "Time to execute one SQL statement",
+    LATENCY_BUCKETS,
+)
+checkout_wait = Histogram(
+    "db_connection_checkout_wait_seconds",
+    "Time a session waited for a pooled connection",
+    LATENCY_BUCKETS,
+)
+slow_queries = CounterMetric(
+    "db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS", ("route",)
+)
+query_budget_exceeded = CounterMetric(
+    "db_query_budget_exceeded_total",
+    "Requests that ran more SQL statements than their route's query budget",
+    ("method", "route"),
+)
+repeated_statements = CounterMetric(
+    "db_repeated_statements_total",
+    "Statements run QUERY_REPEAT_THRESHOLD or more times in one request "
+    "(QUERY_DEBUG only)",
+    ("method", "route"),
+)
+
+
+class RequestStats:
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope
+        self.statements = 0
+        self.sql_seconds = 0.0
+        # Executions per SQL string, kept only in QUERY_DEBUG mode.
+        self.executions = Counter() if QUERY_DEBUG else None
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route") if self.scope else None
+        return getattr(route, "path", UNMATCHED_ROUTE)
+
+    @property
+    def query_budget(self) -> int | None:
+        route = self.scope.get("route") if self.scope else None
+        return getattr(getattr(route, "endpoint", None), "query_budget", None)
+
+
+def _check_queries(method: str, stats: RequestStats):
+    """Report repeated statements and enforce the route's query budget."""
+    route = stats.route
+    for statement, count in (stats.executions or {}).items():
+        if count >= QUERY_REPEAT_THRESHOLD:
+            repeated_statements.inc(method, route)
+            logger.warning(
+                "Possible N+1 on %s %s: %d executions of %s",
+                method,
+                route,
+                count,
+                statement,
+            )
+    budget = stats.query_budget
+    if budget is None or stats.statements <= budget:
+        return
+    query_budget_exceeded.inc(method, route)
+    message = (
+        f"{method} {route} ran {stats.statements} SQL statements, "
+        f"over its budget of {budget}"
+    )
+    if QUERY_DEBUG:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+_current_request: ContextVar[RequestStats | None] = ContextVar(
+    "current_request", default=None
+)
+
+
+class MetricsMiddleware:
+    """Time each HTTP request and the SQL it runs, labelled by route template.
+
+    Pure ASGI rather than ``BaseHTTPMiddleware`` so streamed responses pass
+    through untouched; their latency covers the whole stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = _current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            method, route = scope["method"], stats.route
+            requests_total.inc(method, route, status_code)
+            request_duration.observe(elapsed, method, route)
+            request_statements.observe(stats.statements, method, route)
+            request_sql_duration.observe(stats.sql_seconds, method, route)
+        # Counted after the response, so lazy loads made while serializing it
+        # are included. Under QUERY_DEBUG an overrun raises to the caller,
+        # which fails the request in TestClient-based checks.
+        _check_queries(method, stats)
+
+
+def _parameter_sample(parameters, executemany: bool):
+    if executemany:
+        return list(parameters[:MAX_LOGGED_PARAMETER_SETS])
+    return parameters
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    statement_duration.observe(elapsed)
+    stats = _current_request.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+        if stats.executions is not None:
+            stats.executions[statement] += 1
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        route = stats.route if stats is not None else NO_ROUTE
+        slow_queries.inc(route)
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s; parameters: %r",
+            elapsed * 1000,
+            route,
+            statement,
+            _parameter_sample(parameters, executemany),
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+# A session checks out its connection when its transaction first needs one, so
+# the gap between creating the root transaction and beginning on a connection
+# is the wait on the pool.
+@event.listens_for(Session, "after_transaction_create")
+def _after_transaction_create(session, transaction):
+    if transaction.parent is None:
+        session.info["checkout_started"] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_begin")
+def _after_begin(session, transaction, connection):
+    started = session.info.pop("checkout_started", None)
+    if started is not None:
+        checkout_wait.observe(time.perf_counter() - started)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Enum as SQLAEnum
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Enum as SQLAEnum, Index
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Date
+from sqlalchemy import Table, func, text
 from sqlalchemy.orm import relationship, declarative_base
 from datetime import datetime
-from enums import ChangeReason, SalesChannel
+from enums import ChangeReason, SaleSummeryPeriod, SalesChannel
 from mixins import TimestampMixin, SoftDeleteMixin
 
 Base = declarative_base()
@@ -10,6 +11,7 @@ Base = declarative_base()
 
 class Category(Base, SoftDeleteMixin, TimestampMixin):
     __tablename__ = "categories"
+    __table_args__ = (Index("ix_categories_updated_at", "updated_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
@@ -20,6 +22,10 @@ class Category(Base, SoftDeleteMixin, TimestampMixin):
 
 class Product(Base, SoftDeleteMixin, TimestampMixin):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_category_id", "category_id"),
+        Index("ix_products_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -35,6 +41,11 @@ class Product(Base, SoftDeleteMixin, TimestampMixin):
 
 class Inventory(Base, SoftDeleteMixin, TimestampMixin):
     __tablename__ = "inventory"
+    __table_args__ = (
+        Index("ix_inventory_product_id", "product_id"),
+        Index("ix_inventory_live_stock", "stock", sqlite_where=text("is_deleted = 0")),
+        Index("ix_inventory_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     product_id = Column(Integer, ForeignKey("products.id"))
@@ -46,6 +57,10 @@ class Inventory(Base, SoftDeleteMixin, TimestampMixin):
 
 class Sale(Base, SoftDeleteMixin, TimestampMixin):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_sale_date_id", "sale_date", "id"),
+        Index("ix_sales_product_id_sale_date_id", "product_id", "sale_date", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     product_id = Column(Integer, ForeignKey("products.id"))
@@ -64,6 +79,12 @@ class Sale(Base, SoftDeleteMixin, TimestampMixin):
 
 class InventoryLog(Base, SoftDeleteMixin, TimestampMixin):
     __tablename__ = "inventory_logs"
+    __table_args__ = (
+        Index(
+            "ix_inventory_logs_inventory_id_change_date", "inventory_id", "change_date"
+        ),
+        Index("ix_inventory_logs_change_date", "change_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     inventory_id = Column(Integer, ForeignKey("inventory.id"), nullable=False)
@@ -77,3 +98,84 @@ class InventoryLog(Base, SoftDeleteMixin, TimestampMixin):
     change_date = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     inventory = relationship("Inventory", back_populates="logs")
+
+
+class RevenueRollup(Base, TimestampMixin):
+    __tablename__ = "revenue_rollups"
+
+    period_type = Column(
+        SQLAEnum(SaleSummeryPeriod, name="salesummeryperiod", native_enum=False),
+        primary_key=True,
+    )
+    period = Column(String, primary_key=True)
+    period_start = Column(Date, nullable=False)
+    total_revenue = Column(Float, nullable=False, default=0)
+    sale_count = Column(Integer, nullable=False, default=0)
+
+
+class Counter(Base, TimestampMixin):
+    __tablename__ = "counters"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+class Partition(Base, TimestampMixin):
+    """A sealed month of a partitioned table, stored in its own table."""
+
+    __tablename__ = "partitions"
+    __table_args__ = (
+        Index("ix_partitions_parent_period_start", "parent", "period_start"),
+    )
+
+    name = Column(String, primary_key=True)
+    parent = Column(String, nullable=False)
+    period_start = Column(Date, nullable=False)
+    # Exclusive: the first day of the following month.
+    period_end = Column(Date, nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+
+
+class StockSnapshot(Base):
+    """An inventory item's stock at the start of ``snapshot_date`` (UTC).
+
+    A day with no inventory items yet is marked by one row for inventory id 0.
+    """
+
+    __tablename__ = "stock_snapshots"
+
+    snapshot_date = Column(Date, primary_key=True)
+    inventory_id = Column(Integer, primary_key=True)
+    stock = Column(Integer)
+
+
+def _archive_table(model, *index_columns: str) -> Table:
+    """Copy of ``model``'s columns for rows moved out by ``archive.py``."""
+    name = f"{model.__tablename__}_archive"
+    columns = [
+        Column(
+            column.name,
+            column.type.copy(),
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+        )
+        for column in model.__table__.columns
+    ]
+    indexes = (
+        [Index(f"ix_{name}_{'_'.join(index_columns)}", *index_columns)]
+        if index_columns
+        else []
+    )
+    return Table(
+        name,
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, nullable=False, default=func.now()),
+        *indexes,
+    )
+
+
+products_archive = _archive_table(Product)
+inventory_archive = _archive_table(Inventory)
+sales_archive = _archive_table(Sale, "sale_date", "id")
+inventory_logs_archive = _archive_table(InventoryLog, "inventory_id", "change_date")
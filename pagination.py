@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from errors import ErrorMessages
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(sale_date: datetime, row_id: int) -> str:
+    raw = f"{sale_date.isoformat()}{CURSOR_SEPARATOR}{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sale_date, row_id = raw.split(CURSOR_SEPARATOR)
+        return datetime.fromisoformat(sale_date), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=ErrorMessages.INVALID_CURSOR)
@@ -0,0 +1,234 @@
+import re
+from datetime import date, datetime, time
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    Table,
+    delete,
+    func,
+    insert,
+    select,
+    union_all,
+)
+from sqlalchemy.orm import Session
+
+from config import PARTITION_CHUNK_SIZE
+from models import InventoryLog, Partition, Sale
+
+# Partitioned models and the column whose month picks a row's partition.
+PARTITION_KEYS = {Sale: "sale_date", InventoryLog: "change_date"}
+
+_NAME = re.compile(
+    r"^(%s)_\d{4}_\d{2}$" % "|".join(model.__tablename__ for model in PARTITION_KEYS)
+)
+# Month tables are created at runtime, so they live outside Base.metadata and
+# are invisible to Alembic autogenerate.
+_metadata = MetaData()
+
+
+def is_partition_table(name: str) -> bool:
+    return _NAME.match(name) is not None
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _as_datetime(day: date) -> datetime:
+    return datetime.combine(day, time())
+
+
+def _day(value: date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def month_table(model, month: date) -> Table:
+    """The table holding ``model``'s rows for ``month``, with the same columns
+    and indexes as its parent."""
+    parent = model.__table__
+    name = f"{parent.name}_{month:%Y_%m}"
+    if name in _metadata.tables:
+        return _metadata.tables[name]
+    columns = [
+        Column(
+            column.name,
+            column.type.copy(),
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+        )
+        for column in parent.columns
+    ]
+    indexes = [
+        Index(index.name.replace(parent.name, name, 1), *index.columns.keys())
+        for index in parent.indexes
+    ]
+    return Table(name, _metadata, *columns, *indexes)
+
+
+def tables(
+    db: Session, model, start: date | None = None, end: date | None = None
+) -> list[Table]:
+    """``model``'s table followed by its sealed months that overlap the
+    inclusive range ``start``..``end``, oldest first.
+
+    The table itself is always included: it holds the recent months, plus
+    rows of sealed months written since they were sealed.
+    """
+    if model not in PARTITION_KEYS:
+        return [model.__table__]
+    query = select(Partition.period_start).where(
+        Partition.parent == model.__tablename__
+    )
+    if start is not None:
+        query = query.where(Partition.period_end > _day(start))
+    if end is not None:
+        query = query.where(Partition.period_start <= _day(end))
+    months = db.scalars(query.order_by(Partition.period_start)).all()
+    return [model.__table__, *(month_table(model, month) for month in months)]
+
+
+def union(tables: list[Table], build):
+    """``build(columns)`` run against each table's columns, combined with
+    UNION ALL.
+
+    Order the result through its ``selected_columns``: SQLite then merges the
+    per-table index scans instead of sorting every row.
+    """
+    first, *rest = [build(table.c) for table in tables]
+    if not rest:
+        return first
+    # SQLite matches a compound's ORDER BY against the first SELECT's output
+    # names, and a bare "id" stops matching once the SELECT has a join.
+    first = first.with_only_columns(
+        *(column.label(name) for name, column in first.selected_columns.items())
+    )
+    return union_all(first, *rest)
+
+
+def _move_month(db: Session, model, month: date, chunk_size: int) -> int:
+    table = model.__table__
+    key = table.c[PARTITION_KEYS[model]]
+    end = add_months(month, 1)
+    # SQLite hands out MAX(id) + 1, so moving the newest row would let its id
+    # be reused by a new row and collide with the sealed copy.
+    condition = (
+        (key >= _as_datetime(month))
+        & (key < _as_datetime(end))
+        & (table.c.id < select(func.max(table.c.id)).scalar_subquery())
+    )
+    columns = [column.name for column in table.columns]
+    partition = None
+    moved = 0
+    while True:
+        ids = db.scalars(
+            select(table.c.id).where(condition).order_by(table.c.id).limit(chunk_size)
+        ).all()
+        if not ids:
+            break
+        if partition is None:
+            partition = month_table(model, month)
+            partition.create(db.connection(), checkfirst=True)
+            # Registered before any row moves. A request lists the tables and
+            # reads them in one read transaction (see database.py), so it finds
+            # each row in exactly one of them. Streamed responses read in a
+            # session of their own and can miss rows sealed in between.
+            if db.get(Partition, partition.name) is None:
+                db.add(
+                    Partition(
+                        name=partition.name,
+                        parent=table.name,
+                        period_start=month,
+                        period_end=end,
+                    )
+                )
+            db.commit()
+        db.execute(
+            insert(partition).from_select(
+                columns, select(table).where(table.c.id.in_(ids))
+            )
+        )
+        db.execute(delete(table).where(table.c.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+    if partition is not None:
+        db.get(Partition, partition.name).row_count = db.scalar(
+            select(func.count()).select_from(partition)
+        )
+        db.commit()
+    return moved
+
+
+def seal(
+    db: Session, model, before: date, chunk_size: int = PARTITION_CHUNK_SIZE
+) -> dict:
+    """Move ``model``'s rows dated before the month of ``before`` into one
+    table per month, ``chunk_size`` rows per transaction.
+
+    Months already sealed pick up rows written to them since. Returns the rows
+    moved per month table.
+    """
+    table = model.__table__
+    key = table.c[PARTITION_KEYS[model]]
+    boundary = month_start(before)
+    oldest = db.scalar(select(func.min(key)).where(key < _as_datetime(boundary)))
+    moved = {}
+    month = month_start(oldest) if oldest else boundary
+    while month < boundary:
+        count = _move_month(db, model, month, chunk_size)
+        if count:
+            moved[month_table(model, month).name] = count
+        month = add_months(month, 1)
+    return moved
+
+
+def drop(db: Session, model, before: date) -> dict:
+    """Drop ``model``'s sealed months that end on or before ``before``.
+
+    Each month goes with one DROP TABLE, however many rows it holds; rows of
+    those months still in ``model``'s own table are left alone. The live rows
+    dropped come off ``model``'s dashboard counter in the same transaction.
+    Revenue rollups deliberately keep the dropped months' totals, so reports
+    still cover them, until ``rollups.rebuild()`` runs. Returns the rows
+    dropped per month table.
+    """
+    # counters reads through tables(), so it imports this module.
+    import counters
+
+    counter = next(
+        (
+            counter
+            for counter, counted in counters.COUNTED_MODELS.items()
+            if counted is model
+        ),
+        None,
+    )
+    dropped = {}
+    partitions = db.scalars(
+        select(Partition)
+        .where(
+            Partition.parent == model.__tablename__,
+            Partition.period_end <= before,
+        )
+        .order_by(Partition.period_start)
+    ).all()
+    for partition in partitions:
+        table = month_table(model, partition.period_start)
+        if counter is not None:
+            live = db.scalar(
+                select(func.count())
+                .select_from(table)
+                .where(table.c.is_deleted == False)
+            )
+            counters.increment(db, counter, -live)
+        dropped[partition.name] = partition.row_count
+        table.drop(db.connection())
+        db.delete(partition)
+        db.commit()
+    return dropped
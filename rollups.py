@@ -0,0 +1,122 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+import partitions
+from enums import SaleSummeryPeriod
+from models import RevenueRollup, Sale
+
+PERIOD_FORMATS = {
+    SaleSummeryPeriod.DAILY: "%Y-%m-%d",
+    SaleSummeryPeriod.WEEKLY: "%Y-%W",
+    SaleSummeryPeriod.MONTHLY: "%Y-%m",
+    SaleSummeryPeriod.ANNUAL: "%Y",
+}
+
+
+def resolve_period(period: str, default: SaleSummeryPeriod) -> SaleSummeryPeriod:
+    try:
+        return SaleSummeryPeriod(period)
+    except ValueError:
+        return default
+
+
+def period_start(period: SaleSummeryPeriod, moment: date) -> date:
+    day = moment.date() if isinstance(moment, datetime) else moment
+    if period == SaleSummeryPeriod.DAILY:
+        return day
+    if period == SaleSummeryPeriod.WEEKLY:
+        # "%W" puts the days before the first Monday in week 00, so a week
+        # never starts before January 1st of its year.
+        return max(day - timedelta(days=day.weekday()), date(day.year, 1, 1))
+    if period == SaleSummeryPeriod.MONTHLY:
+        return day.replace(day=1)
+    return date(day.year, 1, 1)
+
+
+def previous_period_start(period: SaleSummeryPeriod, start: date) -> date:
+    return period_start(period, start - timedelta(days=1))
+
+
+def period_key(period: SaleSummeryPeriod, moment: date) -> str:
+    return moment.strftime(PERIOD_FORMATS[period])
+
+
+def _upsert(db: Session, totals: dict):
+    if not totals:
+        return
+    stmt = insert(RevenueRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RevenueRollup.period_type, RevenueRollup.period],
+        set_={
+            "total_revenue": RevenueRollup.total_revenue + stmt.excluded.total_revenue,
+            "sale_count": RevenueRollup.sale_count + stmt.excluded.sale_count,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {
+                "period_type": period,
+                "period": key,
+                "period_start": start,
+                "total_revenue": revenue,
+                "sale_count": count,
+            }
+            for (period, key), (start, revenue, count) in totals.items()
+        ],
+    )
+
+
+def record_sales(db: Session, sales: Iterable[tuple[datetime, float]]):
+    """Add sales to every rollup in the caller's transaction.
+
+    ``sales`` is an iterable of ``(sale_date, total_price)`` pairs.
+    """
+    totals = defaultdict(lambda: [None, 0.0, 0])
+    for sale_date, total_price in sales:
+        for period in SaleSummeryPeriod:
+            start = period_start(period, sale_date)
+            entry = totals[(period, period_key(period, start))]
+            entry[0] = start
+            entry[1] += total_price
+            entry[2] += 1
+    _upsert(db, totals)
+
+
+def record_sale(db: Session, sale_date: datetime, total_price: float):
+    record_sales(db, [(sale_date, total_price)])
+
+
+def rebuild(db: Session) -> int:
+    """Recompute every rollup from the sales table and its sealed months;
+    returns the row count."""
+    db.query(RevenueRollup).delete()
+    totals = {}
+    for table in partitions.tables(db, Sale):
+        sale_date = table.c.sale_date
+        for period, date_format in PERIOD_FORMATS.items():
+            rows = db.execute(
+                select(
+                    func.strftime(date_format, sale_date).label("period"),
+                    func.min(sale_date),
+                    func.sum(table.c.total_price),
+                    func.count(table.c.id),
+                )
+                .where(sale_date.isnot(None))
+                .group_by("period")
+            ).all()
+            for key, first_sale_date, revenue, count in rows:
+                _, total_revenue, sale_count = totals.get((period, key), (None, 0, 0))
+                totals[(period, key)] = (
+                    period_start(period, first_sale_date),
+                    total_revenue + revenue,
+                    sale_count + count,
+                )
+    _upsert(db, totals)
+    return len(totals)
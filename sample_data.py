@@ -0,0 +1,287 @@
+import math
+import random
+from datetime import date, datetime, time, timedelta
+from itertools import accumulate
+
+from sqlalchemy import bindparam, delete, insert, update
+from sqlalchemy.orm import Session
+
+import partitions
+from archive import ARCHIVE_TABLES
+from enums import ChangeReason, SalesChannel
+from models import (
+    Category,
+    Counter,
+    Inventory,
+    InventoryLog,
+    Product,
+    RevenueRollup,
+    Sale,
+    StockSnapshot,
+)
+
+INSERT_CHUNK_SIZE = 50000
+
+DEPARTMENTS = (
+    ("Electronics", "Gadgets and devices"),
+    ("Home Appliances", "Kitchen and home utilities"),
+    ("Books", "Fiction, non-fiction, educational"),
+    ("Clothing", "Apparel and accessories"),
+    ("Toys", "Games and toys for all ages"),
+    ("Sports", "Fitness and outdoor equipment"),
+    ("Garden", "Plants, tools and furniture"),
+    ("Beauty", "Cosmetics and personal care"),
+    ("Grocery", "Food and household essentials"),
+    ("Office", "Stationery and office supplies"),
+)
+
+# Relative demand by weekday (Monday first), month, and hour of the day.
+WEEKDAY_WEIGHTS = (0.9, 0.85, 0.9, 0.95, 1.1, 1.35, 1.2)
+MONTH_WEIGHTS = (0.8, 0.75, 0.9, 0.95, 1.0, 0.95, 0.9, 0.95, 1.0, 1.05, 1.35, 1.75)
+# fmt: off
+HOUR_WEIGHTS = (
+    0.2, 0.2, 0.2, 0.2, 0.2, 0.2, 0.5, 0.8, 1.0, 1.2, 1.4, 1.5,
+    1.6, 1.5, 1.4, 1.4, 1.5, 1.7, 1.9, 2.0, 1.8, 1.3, 0.8, 0.4,
+)
+# fmt: on
+CHANNEL_WEIGHTS = {
+    SalesChannel.ONLINE: 0.45,
+    SalesChannel.RETAIL: 0.3,
+    SalesChannel.PHONE: 0.08,
+    SalesChannel.EMAIL: 0.07,
+    SalesChannel.SOCIAL_MEDIA: 0.07,
+    SalesChannel.OTHER: 0.03,
+}
+QUANTITY_WEIGHTS = {1: 0.55, 2: 0.22, 3: 0.11, 4: 0.07, 5: 0.05}
+# How an inventory log changes stock, once the level allows a decrease.
+LOG_REASON_WEIGHTS = {
+    ChangeReason.SALE: 0.6,
+    ChangeReason.RESTOCK: 0.15,
+    ChangeReason.RETURN: 0.1,
+    ChangeReason.DAMAGE: 0.05,
+    ChangeReason.MANUAL_ADJUSTMENT: 0.1,
+}
+REORDER_LEVEL = 10
+
+
+def _daily_counts(
+    rng: random.Random, total: int, start: date, days: int, growth: float
+) -> list[int]:
+    """Split ``total`` rows over ``days`` days by weekday, month and trend."""
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weights.append(
+            WEEKDAY_WEIGHTS[day.weekday()]
+            * MONTH_WEIGHTS[day.month - 1]
+            * (1 + growth * offset / max(days - 1, 1))
+            * rng.uniform(0.85, 1.15)
+        )
+    scale = total / sum(weights)
+    counts = [math.floor(weight * scale) for weight in weights]
+    # Hand the rows lost to rounding to the days with the largest remainders.
+    by_remainder = sorted(range(days), key=lambda i: counts[i] - weights[i] * scale)
+    for i in by_remainder[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _moments(rng: random.Random, day: date, count: int) -> list[datetime]:
+    midnight = datetime.combine(day, time())
+    hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=count)
+    return sorted(
+        midnight + timedelta(seconds=hour * 3600 + rng.randrange(3600))
+        for hour in hours
+    )
+
+
+def _popularity(rng: random.Random, ids: list[int], exponent: float) -> list[float]:
+    """Cumulative Zipf weights for ``ids``, ranked in a random order."""
+    ranks = list(range(1, len(ids) + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1 / rank**exponent for rank in ranks))
+
+
+def _flush(db: Session, model, rows: list[dict]):
+    if rows:
+        # Through the connection, so the ORM doesn't split the executemany into
+        # a statement per run of rows with the same NULL columns.
+        db.connection().execute(insert(model), rows)
+        db.commit()
+        rows.clear()
+
+
+def clear(db: Session):
+    """Delete every row the generator writes, children first, including sealed
+    months and archived rows, and the stock snapshots taken of them."""
+    for model in partitions.PARTITION_KEYS:
+        partitions.drop(db, model, date.max)
+    for table in ARCHIVE_TABLES.values():
+        db.execute(delete(table))
+    for model in (
+        StockSnapshot,
+        Sale,
+        InventoryLog,
+        Inventory,
+        Product,
+        Category,
+        RevenueRollup,
+        Counter,
+    ):
+        db.execute(delete(model))
+    db.commit()
+
+
+def generate(
+    db: Session,
+    *,
+    categories: int = 10,
+    products: int = 1000,
+    sales: int = 100000,
+    logs: int = 20000,
+    seed: int = 42,
+    end: date | None = None,
+    days: int = 730,
+    zipf_exponent: float = 1.1,
+    growth: float = 0.3,
+    customers: int | None = None,
+    chunk_size: int = INSERT_CHUNK_SIZE,
+) -> dict:
+    """Bulk insert a reproducible catalog, inventory history and sales.
+
+    Sales are spread over the ``days`` days ending on ``end`` (default: today)
+    with weekly, yearly and growth seasonality, pick products by a Zipf
+    popularity and channels by a fixed mix, and are inserted in date order.
+    The same ``seed``, sizes and ``end`` always produce the same rows.
+    Revenue rollups and counters are left for the caller to rebuild.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=days - 1)
+    customers = customers or max(sales // 20, 1)
+
+    category_ids = db.scalars(
+        insert(Category).returning(Category.id, sort_by_parameter_order=True),
+        [
+            {
+                "name": name if i < len(DEPARTMENTS) else f"{name} {i + 1}",
+                "description": description,
+            }
+            for i in range(categories)
+            for name, description in [DEPARTMENTS[i % len(DEPARTMENTS)]]
+        ],
+    ).all()
+
+    product_rows = []
+    for i in range(products):
+        category_index = rng.randrange(categories)
+        product_rows.append(
+            {
+                "name": f"{DEPARTMENTS[category_index % len(DEPARTMENTS)][0]} "
+                f"item {i + 1}",
+                "price": max(round(math.exp(rng.gauss(3.5, 1.0)), 2), 0.99),
+                "category_id": category_ids[category_index],
+            }
+        )
+    product_ids = db.scalars(
+        insert(Product).returning(Product.id, sort_by_parameter_order=True),
+        product_rows,
+    ).all()
+    prices = {
+        product_id: row["price"] for product_id, row in zip(product_ids, product_rows)
+    }
+    popularity = _popularity(rng, product_ids, zipf_exponent)
+
+    stock = [rng.randint(50, 500) for _ in product_ids]
+    # Stocked from the first day, so stock as of any day in range covers them.
+    stocked_at = datetime.combine(start, time())
+    inventory_ids = db.scalars(
+        insert(Inventory).returning(Inventory.id, sort_by_parameter_order=True),
+        [
+            {"product_id": product_id, "stock": level, "created_at": stocked_at}
+            for product_id, level in zip(product_ids, stock)
+        ],
+    ).all()
+    db.commit()
+
+    # Stock moves follow sales, so popular products get the most log entries.
+    positions = list(range(len(inventory_ids)))
+    reasons, reason_weights = zip(*LOG_REASON_WEIGHTS.items())
+    rows = []
+    for offset, count in enumerate(_daily_counts(rng, logs, start, days, growth)):
+        moments = _moments(rng, start + timedelta(days=offset), count)
+        picks = rng.choices(positions, cum_weights=popularity, k=count)
+        for moment, position in zip(moments, picks):
+            old_stock = stock[position]
+            if old_stock < REORDER_LEVEL:
+                reason = ChangeReason.RESTOCK
+            else:
+                reason = rng.choices(reasons, weights=reason_weights)[0]
+            if reason == ChangeReason.RESTOCK:
+                change = rng.randint(50, 300)
+            elif reason == ChangeReason.RETURN:
+                change = rng.randint(1, 3)
+            elif reason == ChangeReason.MANUAL_ADJUSTMENT:
+                change = rng.randint(-5, 5)
+            else:
+                change = -rng.randint(1, 5)
+            stock[position] = max(old_stock + change, 0)
+            rows.append(
+                {
+                    "inventory_id": inventory_ids[position],
+                    "old_stock": old_stock,
+                    "new_stock": stock[position],
+                    "change_reason": reason,
+                    "change_date": moment,
+                }
+            )
+        if len(rows) >= chunk_size:
+            _flush(db, InventoryLog, rows)
+    _flush(db, InventoryLog, rows)
+    db.connection().execute(
+        update(Inventory)
+        .where(Inventory.id == bindparam("inventory_id"))
+        .values(stock=bindparam("stock")),
+        [
+            {"inventory_id": inventory_id, "stock": level}
+            for inventory_id, level in zip(inventory_ids, stock)
+        ],
+    )
+    db.commit()
+
+    channels, channel_weights = zip(*CHANNEL_WEIGHTS.items())
+    quantities, quantity_weights = zip(*QUANTITY_WEIGHTS.items())
+    for offset, count in enumerate(_daily_counts(rng, sales, start, days, growth)):
+        moments = _moments(rng, start + timedelta(days=offset), count)
+        picks = rng.choices(product_ids, cum_weights=popularity, k=count)
+        picked_channels = rng.choices(channels, weights=channel_weights, k=count)
+        picked_quantities = rng.choices(quantities, weights=quantity_weights, k=count)
+        for moment, product_id, channel, quantity in zip(
+            moments, picks, picked_channels, picked_quantities
+        ):
+            rows.append(
+                {
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "total_price": round(prices[product_id] * quantity, 2),
+                    "sale_date": moment,
+                    "channel": channel,
+                    # Walk-in retail customers rarely leave an email address.
+                    "customer_email": (
+                        None
+                        if channel == SalesChannel.RETAIL and rng.random() < 0.8
+                        else f"customer{rng.randrange(customers)}@example.com"
+                    ),
+                }
+            )
+        if len(rows) >= chunk_size:
+            _flush(db, Sale, rows)
+    _flush(db, Sale, rows)
+
+    return {
+        "categories": len(category_ids),
+        "products": len(product_ids),
+        "inventory": len(inventory_ids),
+        "inventory_logs": logs,
+        "sales": sales,
+    }
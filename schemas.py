@@ -1,7 +1,7 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
-from datetime import datetime
-from enums import ChangeReason, SalesChannel
+from typing import List, Optional
+from datetime import date, datetime
+from enums import BatchItemStatus, ChangeReason, SalesChannel
 
 
 class Config:
@@ -89,6 +89,14 @@ class SaleRead(SaleBase):
         pass
 
 
+class SaleBatchItemRead(BaseModel):
+    index: int
+    product_id: int
+    status: BatchItemStatus
+    sale_id: Optional[int] = None
+    error: Optional[str] = None
+
+
 class RevenueComparisonRead(BaseModel):
     current_period: str
     current_revenue: float
@@ -110,6 +118,18 @@ class LowStockRead(BaseModel):
         pass
 
 
+class StockLevelRead(BaseModel):
+    id: int
+    product_id: int
+    stock: Optional[int]
+
+
+class InventoryAsOfRead(BaseModel):
+    as_of: datetime
+    snapshot_date: date
+    items: List[StockLevelRead]
+
+
 class InventoryUpdate(BaseModel):
     stock: int
     change_reason: ChangeReason
@@ -123,3 +143,26 @@ class InventoryUpdateRead(BaseModel):
 
     class Config(Config):
         pass
+
+
+class InventoryBulkUpdate(InventoryUpdate):
+    inventory_id: int
+
+
+class InventoryBulkUpdateRead(BaseModel):
+    index: int
+    inventory_id: int
+    status: BatchItemStatus
+    old_stock: Optional[int] = None
+    new_stock: Optional[int] = None
+    error: Optional[str] = None
+
+
+class CatalogImportRead(BaseModel):
+    rows: int
+    imported: int
+    rejected: int
+    categories_created: int
+    elapsed_seconds: float
+    rows_per_second: int
+    errors: List[str]
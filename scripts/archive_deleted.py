@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+from datetime import timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from archive import archive_deleted
+from config import ARCHIVE_AFTER_DAYS, ARCHIVE_CHUNK_SIZE
+from database import SessionLocal
+
+
+def _size(rows, used_bytes):
+    if used_bytes is None:
+        return f"{rows:,} rows"
+    return f"{rows:,} rows, {used_bytes / 1024:,.0f} KiB"
+
+
+def archive(days: float, chunk_size: int):
+    db: Session = SessionLocal()
+    try:
+        report = archive_deleted(db, timedelta(days=days), chunk_size)
+        print(f"✅ Archived soft-deleted rows older than {days:g} days:")
+        for table, stats in report.items():
+            print(
+                f"  - {table}: {stats['archived']:,} archived, "
+                f"{_size(stats['rows_before'], stats['bytes_before'])} -> "
+                f"{_size(stats['rows_after'], stats['bytes_after'])}, "
+                f"{stats['deleted_kept']:,} deleted rows kept"
+            )
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move old soft-deleted rows into the archive tables."
+    )
+    parser.add_argument("--days", type=float, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+    args = parser.parse_args()
+    archive(args.days, args.chunk_size)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from rollups import rebuild
+
+
+def backfill_rollups():
+    db: Session = SessionLocal()
+    try:
+        periods = rebuild(db)
+        db.commit()
+        print(f"✅ Rebuilt {periods} revenue rollup periods.")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_rollups()
@@ -0,0 +1,154 @@
+"""Fire many parallel sales at one SKU and check nothing is oversold or lost.
+
+Every sale is sent concurrently through the ASGI app against a scratch
+database. Afterwards the successful sales, the remaining stock, the SALE
+inventory logs and the dashboard counter must all agree.
+
+    python scripts/check_concurrent_sales.py --stock 100 --sales 400
+
+Run it with GROUP_COMMIT=1 to send the sales through the group-commit queue.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from database import make_engine
+from enums import BatchItemStatus, ChangeReason, DashboardCounter, SalesChannel
+import main as api
+from group_commit import BatchSession
+from main import app, get_db, get_read_db
+from models import Base, Category, Counter, Inventory, InventoryLog, Product, Sale
+
+
+async def fire_sales(product_id, sales, quantity, batch):
+    """Send the sales concurrently and return the number that were created."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        payload = {
+            "product_id": product_id,
+            "quantity": quantity,
+            "total_price": 0,
+            "channel": SalesChannel.ONLINE.value,
+        }
+        requests = []
+        for sent in range(0, sales, batch):
+            items = min(batch, sales - sent)
+            if batch == 1:
+                requests.append(client.post(f"/sales/{product_id}", json=payload))
+            else:
+                requests.append(client.post("/sales/batch", json=[payload] * items))
+        responses = await asyncio.gather(*requests)
+
+    created = 0
+    for response in responses:
+        if batch == 1:
+            created += response.status_code == 200
+        elif response.status_code == 200:
+            created += sum(
+                item["status"] == BatchItemStatus.CREATED.value
+                for item in response.json()
+            )
+    return created
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--sales", type=int, default=400)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument(
+        "--batch", type=int, default=1, help="send sales through /sales/batch"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{os.path.join(directory, 'sales.sqlite3')}")
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with SessionLocal() as db:
+            product = Product(
+                name="Contended SKU", price=10.0, category=Category(name="Hot")
+            )
+            db.add_all([product, Inventory(product=product, stock=args.stock)])
+            db.commit()
+            product_id = product.id
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        if api.write_queue is not None:
+            api.write_queue.session_factory = sessionmaker(
+                class_=BatchSession,
+                autoflush=False,
+                bind=make_engine(engine.url, begin_immediate=True),
+            )
+        try:
+            succeeded = asyncio.run(
+                fire_sales(product_id, args.sales, args.quantity, args.batch)
+            )
+        finally:
+            app.dependency_overrides.clear()
+            if api.write_queue is not None:
+                api.write_queue.stop()
+                stats = api.write_queue.stats()
+                print(
+                    f"Group commit: {stats['writes']} writes in "
+                    f"{stats['batches']} batches (max {stats['max_batch_size']})."
+                )
+                api.write_queue.session_factory.kw["bind"].dispose()
+
+        with SessionLocal() as db:
+            stock = db.query(Inventory.stock).filter_by(product_id=product_id).scalar()
+            sold = db.query(func.coalesce(func.sum(Sale.quantity), 0)).scalar()
+            logged = (
+                db.query(InventoryLog)
+                .filter_by(change_reason=ChangeReason.SALE)
+                .count()
+            )
+            counted = (
+                db.query(Counter.value)
+                .filter_by(name=DashboardCounter.SALES.value)
+                .scalar()
+            )
+        engine.dispose()
+
+    expected = min(args.sales, args.stock // args.quantity)
+    checks = {
+        "successful sales": (succeeded, expected),
+        "units sold": (sold, expected * args.quantity),
+        "remaining stock": (stock, args.stock - expected * args.quantity),
+        "SALE inventory logs": (logged, expected),
+        "sales counter": (counted, expected),
+    }
+    failures = {
+        name: values for name, values in checks.items() if values[0] != values[1]
+    }
+    if failures:
+        print("❌ Concurrent sales are inconsistent (got, expected):")
+        for name, (got, wanted) in failures.items():
+            print(f"  - {name}: {got}, {wanted}")
+        sys.exit(1)
+    print(
+        f"✅ {args.sales} concurrent sales against {args.stock} units: "
+        f"{succeeded} sold, {args.sales - succeeded} rejected, stock {stock}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Fail when a list endpoint's SQL statement count grows with its result size.
+
+Seeds a scratch database twice, at two sizes, calls each endpoint below
+in-process and compares the number of statements each request issued. Any
+difference means rows are being loaded one by one (an N+1 pattern). Runs with
+QUERY_DEBUG on, so a request over its route's query budget fails too. January's
+sales are sealed into their own table, so reads also go through partitions, and
+today's stock snapshot is written for the as-of case.
+
+    python scripts/check_query_counts.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QUERY_DEBUG", "1")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from enums import ChangeReason, SalesChannel
+from database import make_engine
+from main import app, get_db, get_read_db
+from metrics import QueryBudgetExceeded
+from models import Base, Category, Inventory, InventoryLog, Product, Sale
+from partitions import seal
+from snapshots import write as write_snapshot
+
+SIZES = (5, 50)
+
+CASES = [
+    ("GET", "/", {}),
+    ("GET", "/categories/", {}),
+    ("GET", "/products/", {}),
+    ("GET", "/inventory/", {}),
+    ("GET", "/inventory/low-stock/", {"threshold": 1000}),
+    ("GET", "/inventory/logs/", {}),
+    ("GET", "/inventory/as-of", {"date": f"{datetime.utcnow():%Y-%m-%d}T23:59:59"}),
+    ("GET", "/sales/", {}),
+    ("GET", "/sales/summary/", {"period": "daily"}),
+    ("GET", "/sales/comparison/", {"period": "daily"}),
+    ("GET", "/sales/1", {}),
+]
+
+
+def seed(db, size):
+    for i in range(size):
+        category = Category(name=f"Category {i}")
+        product = Product(name=f"Product {i}", price=10.0 + i, category=category)
+        inventory = Inventory(product=product, stock=i, created_at=datetime(2025, 1, 1))
+        db.add_all([category, product, inventory])
+        db.flush()
+        db.add(
+            InventoryLog(
+                inventory_id=inventory.id,
+                old_stock=0,
+                new_stock=i,
+                change_reason=ChangeReason.RESTOCK,
+            )
+        )
+        db.add(
+            Sale(
+                product=product,
+                quantity=1,
+                total_price=product.price,
+                sale_date=datetime(2025, 1, 1) + timedelta(days=i),
+                channel=SalesChannel.ONLINE,
+            )
+        )
+    db.commit()
+    seal(db, Sale, date(2025, 2, 1))
+    write_snapshot(db, datetime.utcnow().date())
+
+
+def count_statements(directory, size, failures):
+    url = f"sqlite:///{os.path.join(directory, f'counts_{size}.sqlite3')}"
+    engine = make_engine(url)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with SessionLocal() as db:
+        seed(db, size)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    counts = {}
+    try:
+        client = TestClient(app)
+        for method, path, params in CASES:
+            statements.clear()
+            try:
+                response = client.request(method, path, params=params)
+            except QueryBudgetExceeded as exc:
+                failures.append(f"{exc} with {size} rows")
+                continue
+            response.raise_for_status()
+            counts[(method, path)] = len(statements)
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+    return counts
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        small, large = (count_statements(directory, size, failures) for size in SIZES)
+
+    for (method, path), count in small.items():
+        if (method, path) in large and count != large[(method, path)]:
+            failures.append(
+                f"{method} {path}: {count} statements for {SIZES[0]} rows, "
+                f"{large[(method, path)]} for {SIZES[1]}"
+            )
+    if failures:
+        print("❌ Statement counts depend on result size or exceed a budget:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(
+        f"✅ {len(CASES)} endpoints issue a fixed number of statements "
+        "within their budgets."
+    )
+
+
+if __name__ == "__main__":
+    main()
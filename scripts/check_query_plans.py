@@ -0,0 +1,162 @@
+"""Fail when an endpoint's query falls back to a full table scan.
+
+Migrates a scratch database to head, calls each endpoint below in-process,
+and runs EXPLAIN QUERY PLAN on every SELECT it issued. A bare
+``SCAN <table>`` step on one of the hot tables, or on a sealed month of one,
+is reported as a regression.
+
+    python scripts/check_query_plans.py
+"""
+
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from enums import ChangeReason, SalesChannel
+from database import make_engine
+from main import app, get_db, get_read_db
+from models import Category, Inventory, InventoryLog, Product, Sale
+from partitions import is_partition_table, seal
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HOT_TABLES = {"categories", "products", "inventory", "sales", "inventory_logs"}
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+CASES = [
+    ("GET", "/", {}),
+    ("GET", "/sales/", {"start_date": "2025-01-10T00:00:00"}),
+    (
+        "GET",
+        "/sales/",
+        {"start_date": "2025-01-10T00:00:00", "end_date": "2025-01-20T00:00:00"},
+    ),
+    ("GET", "/sales/", {"product_id": 1}),
+    ("GET", "/sales/", {"category_id": 1}),
+    ("GET", "/sales/summary/", {"period": "monthly"}),
+    ("GET", "/sales/comparison/", {"period": "daily", "start_date": "2025-01-10"}),
+    # Above LOW_STOCK_THRESHOLD, so it is answered by a query, not the index.
+    ("GET", "/inventory/low-stock/", {"threshold": 50}),
+    ("GET", "/inventory/logs/", {"inventory_id": 1}),
+    ("GET", "/inventory/1", {}),
+    ("GET", "/products/1", {}),
+    ("GET", "/sales/1", {}),
+]
+
+
+def migrate(url):
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+
+def seed(db):
+    category = Category(name="Electronics")
+    db.add(category)
+    db.flush()
+    for i in range(20):
+        product = Product(name=f"Product {i}", price=10.0 + i, category=category)
+        inventory = Inventory(product=product, stock=i)
+        db.add_all([product, inventory])
+        db.flush()
+        db.add(
+            InventoryLog(
+                inventory_id=inventory.id,
+                old_stock=0,
+                new_stock=i,
+                change_reason=ChangeReason.RESTOCK,
+            )
+        )
+        for day in range(5):
+            db.add(
+                Sale(
+                    product=product,
+                    quantity=1,
+                    total_price=product.price,
+                    sale_date=datetime(2024, 12, 25) + timedelta(days=i + day),
+                    channel=SalesChannel.ONLINE,
+                )
+            )
+    db.commit()
+    seal(db, Sale, date(2025, 1, 1))
+
+
+def full_scans(connection, statement, parameters):
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    scans = []
+    for row in plan:
+        match = FULL_SCAN.match(row[-1])
+        table = match and match.group(1)
+        if table and (table in HOT_TABLES or is_partition_table(table)):
+            scans.append(row[-1])
+    return scans
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'plans.sqlite3')}"
+        migrate(url)
+        engine = make_engine(url)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        with SessionLocal() as db:
+            seed(db)
+
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
+        client = TestClient(app)
+        failures = []
+        try:
+            for method, path, params in CASES:
+                statements.clear()
+                response = client.request(method, path, params=params)
+                if response.status_code != 200:
+                    failures.append(f"{method} {path} {params}: {response.status_code}")
+                    continue
+                captured = list(statements)
+                with engine.connect() as connection:
+                    for statement, parameters in captured:
+                        for scan in full_scans(connection, statement, parameters):
+                            failures.append(
+                                f"{method} {path} {params}: {scan}\n    {statement}"
+                            )
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    if failures:
+        print("❌ Full table scans found:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"✅ {len(CASES)} endpoint queries use indexes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,127 +1,48 @@
+import argparse
 import os
 import sys
-import random
-from datetime import datetime, timedelta
+import time
+from datetime import date
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import Session
 
-from models import Category, Product, Inventory, Sale, InventoryLog
-from enums import SalesChannel, ChangeReason
+from database import SessionLocal
+from counters import reconcile as reconcile_counters
+from rollups import rebuild as rebuild_rollups
+from sample_data import clear, generate
 
-DATABASE_URL = "sqlite:///./db.sqlite3"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},  # required for SQLite
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def create_demo_data():
+def create_demo_data(args):
     db: Session = SessionLocal()
     try:
-        # Soft-delete existing data
-        db.query(Sale).filter_by(is_deleted=False).update({"is_deleted": True})
-        db.query(InventoryLog).filter_by(is_deleted=False).update({"is_deleted": True})
-        db.query(Inventory).filter_by(is_deleted=False).update({"is_deleted": True})
-        db.query(Product).filter_by(is_deleted=False).update({"is_deleted": True})
-        db.query(Category).filter_by(is_deleted=False).update({"is_deleted": True})
-        db.commit()
-
-        # Create categories
-        categories = [
-            Category(name="Electronics", description="Gadgets and devices"),
-            Category(name="Home Appliances", description="Kitchen and home utilities"),
-            Category(name="Books", description="Fiction, non-fiction, educational"),
-        ]
-        db.add_all(categories)
-        db.commit()
-
-        # Create products
-        products = [
-            Product(
-                name="Smartphone",
-                price=699.99,
-                description="Latest model",
-                category=categories[0],
-            ),
-            Product(
-                name="Microwave",
-                price=149.99,
-                description="800W microwave",
-                category=categories[1],
-            ),
-            Product(
-                name="Python Book",
-                price=39.99,
-                description="Learn Python",
-                category=categories[2],
-            ),
-        ]
-        db.add_all(products)
-        db.commit()
-
-        # Create inventory
-        inventories = []
-        for product in products:
-            inventory = Inventory(product=product, stock=random.randint(10, 100))
-            db.add(inventory)
-            inventories.append(inventory)
-        db.commit()
-
-        # Create inventory logs (simulate stock changes)
-        for inventory in inventories:
-            initial_stock = inventory.stock
-            for i in range(3):  # Simulate 3 stock changes per inventory
-                old_stock = inventory.stock
-                stock_change = random.randint(-5, 10)  # Random change
-                new_stock = max(0, old_stock + stock_change)  # Prevent negative stock
-
-                # Determine change reason based on stock change
-                if stock_change > 0:
-                    reason = ChangeReason.RESTOCK
-                elif stock_change < 0:
-                    reason = random.choice(
-                        [ChangeReason.SALE, ChangeReason.DAMAGE, ChangeReason.RETURN]
-                    )
-                else:
-                    reason = ChangeReason.MANUAL_ADJUSTMENT
-
-                inventory.stock = new_stock
-                db.add(
-                    InventoryLog(
-                        inventory=inventory,
-                        old_stock=old_stock,
-                        new_stock=new_stock,
-                        change_reason=reason,
-                        change_date=datetime.utcnow()
-                        - timedelta(days=random.randint(0, 90)),
-                    )
-                )
-        db.commit()
-
-        # Create sales
-        for product in products:
-            for i in range(10):
-                qty = random.randint(1, 5)
-                db.add(
-                    Sale(
-                        product=product,
-                        quantity=qty,
-                        total_price=qty * product.price,
-                        sale_date=datetime.utcnow()
-                        - timedelta(days=random.randint(0, 90)),
-                        channel=random.choice(list(SalesChannel)),
-                        customer_email=f"user{i}@example.com",
-                    )
-                )
+        started = time.perf_counter()
+        # Replace any existing data; rows are generated with fixed names and ids
+        clear(db)
+        counts = generate(
+            db,
+            categories=args.categories,
+            products=args.products,
+            sales=args.sales,
+            logs=args.logs,
+            seed=args.seed,
+            end=args.end,
+            days=args.days,
+            zipf_exponent=args.zipf_exponent,
+        )
+
+        # Rebuild revenue rollups and dashboard counters for the rows above
+        rebuild_rollups(db)
+        reconcile_counters(db)
         db.commit()
 
-        print("✅ Demo data created successfully.")
+        elapsed = time.perf_counter() - started
+        rows = sum(counts.values())
+        print(
+            f"✅ Demo data created in {elapsed:.1f}s "
+            f"({rows / elapsed * 60:,.0f} rows/min): {counts}"
+        )
 
     except Exception as e:
         db.rollback()
@@ -131,4 +52,19 @@ def create_demo_data():
 
 
 if __name__ == "__main__":
-    create_demo_data()
+    parser = argparse.ArgumentParser(
+        description="Replace the database contents with seeded demo data."
+    )
+    parser.add_argument("--categories", type=int, default=10)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--sales", type=int, default=100000)
+    parser.add_argument("--logs", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        help="last day with sales (YYYY-MM-DD); defaults to today",
+    )
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--zipf-exponent", type=float, default=1.1)
+    create_demo_data(parser.parse_args())
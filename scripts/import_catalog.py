@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from enums import ImportFormat
+from importer import IMPORT_CHUNK_SIZE, import_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Import products, categories and initial stock from a file."
+    )
+    parser.add_argument("path", help="CSV or NDJSON file with one product per row")
+    parser.add_argument("--format", type=ImportFormat, choices=list(ImportFormat))
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    import_format = args.format or (
+        ImportFormat.NDJSON
+        if args.path.endswith((".ndjson", ".jsonl"))
+        else ImportFormat.CSV
+    )
+
+    db: Session = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            report = import_catalog(db, stream, import_format, args.chunk_size)
+        print(
+            f"✅ Imported {report['imported']} of {report['rows']} rows "
+            f"({report['categories_created']} new categories) in "
+            f"{report['elapsed_seconds']}s, {report['rows_per_second']} rows/sec."
+        )
+        for error in report["errors"]:
+            print(f"  - {error}")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from config import (
+    PARTITION_CHUNK_SIZE,
+    PARTITION_HOT_MONTHS,
+    PARTITION_RETENTION_MONTHS,
+)
+from database import SessionLocal
+from partitions import PARTITION_KEYS, add_months, drop, month_start, seal
+
+
+def partition(hot_months: int, retention_months: int, chunk_size: int):
+    db: Session = SessionLocal()
+    try:
+        current = month_start(date.today())
+        sealed_before = add_months(current, 1 - hot_months)
+        for model in PARTITION_KEYS:
+            moved = seal(db, model, sealed_before, chunk_size)
+            print(
+                f"✅ Sealed {model.__tablename__} before {sealed_before:%Y-%m}: "
+                f"{sum(moved.values()):,} rows moved"
+            )
+            for name, count in moved.items():
+                print(f"  - {name}: {count:,} rows")
+            if retention_months:
+                before = add_months(current, -retention_months)
+                dropped = drop(db, model, before)
+                print(
+                    f"✅ Dropped {model.__tablename__} months before "
+                    f"{before:%Y-%m}: {len(dropped)} tables"
+                )
+                for name, count in dropped.items():
+                    print(f"  - {name}: {count:,} rows")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Seal old months of sales and inventory logs into per-month "
+        "tables and drop those past retention."
+    )
+    parser.add_argument(
+        "--hot-months",
+        type=int,
+        default=PARTITION_HOT_MONTHS,
+        help="Months, counting the current one, left in the main tables.",
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=PARTITION_RETENTION_MONTHS,
+        help="Drop sealed months older than this; 0 keeps them.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=PARTITION_CHUNK_SIZE)
+    args = parser.parse_args()
+    partition(args.hot_months, args.retention_months, args.chunk_size)
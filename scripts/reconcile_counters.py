@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from counters import reconcile
+
+
+def reconcile_counters():
+    db: Session = SessionLocal()
+    try:
+        values = reconcile(db)
+        db.commit()
+        print(f"✅ Reconciled dashboard counters: {values}")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reconcile_counters()
@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy.orm import Session
+
+from config import STOCK_SNAPSHOT_RETENTION_DAYS
+from snapshots import SnapshotSessionLocal, prune, write_missing
+
+
+def snapshot(days: int | None, retention_days: int):
+    db: Session = SnapshotSessionLocal()
+    try:
+        today = datetime.utcnow().date()
+        since = today - timedelta(days=days - 1) if days else None
+        written = write_missing(db, today, since)
+        print(f"✅ Wrote {len(written)} stock snapshots")
+        for day, rows in sorted(written.items()):
+            print(f"  - {day}: {rows:,} items")
+        if retention_days:
+            before = today - timedelta(days=retention_days)
+            deleted = prune(db, before)
+            print(f"✅ Deleted {len(deleted)} stock snapshots before {before}")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write the missing daily stock snapshots, newest first, and "
+        "delete those past retention."
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="Cover the last DAYS days, counting today; by default only the "
+        "days since the latest snapshot.",
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=STOCK_SNAPSHOT_RETENTION_DAYS,
+        help="Delete snapshots older than this; 0 keeps them.",
+    )
+    args = parser.parse_args()
+    snapshot(args.days, args.retention_days)
@@ -0,0 +1,121 @@
+import orjson
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from models import Category, Inventory, InventoryLog, Product
+
+# Columns in the field order of the matching read schema, so the fast path
+# produces exactly the JSON the response models would.
+CATEGORY_COLUMNS = (
+    Category.name,
+    Category.description,
+    Category.id,
+    Category.created_at,
+    Category.updated_at,
+)
+PRODUCT_COLUMNS = (
+    Product.name,
+    Product.price,
+    Product.description,
+    Product.category_id,
+    Product.id,
+)
+INVENTORY_LOG_COLUMNS = (
+    InventoryLog.id,
+    InventoryLog.inventory_id,
+    InventoryLog.old_stock,
+    InventoryLog.new_stock,
+    InventoryLog.change_reason,
+    InventoryLog.change_date,
+)
+
+
+def json_response(content, **kwargs) -> Response:
+    """Encode ``content`` with orjson, bypassing response model validation."""
+    return Response(orjson.dumps(content), media_type="application/json", **kwargs)
+
+
+def _category(row, offset: int) -> dict | None:
+    if row[offset + 2] is None:
+        return None
+    return {
+        "name": row[offset],
+        "description": row[offset + 1],
+        "id": row[offset + 2],
+        "created_at": row[offset + 3],
+        "updated_at": row[offset + 4],
+    }
+
+
+def _product(row, offset: int) -> dict | None:
+    if row[offset + 4] is None:
+        return None
+    return {
+        "name": row[offset],
+        "price": row[offset + 1],
+        "description": row[offset + 2],
+        "category_id": row[offset + 3],
+        "id": row[offset + 4],
+        "category": _category(row, offset + 7),
+        "created_at": row[offset + 5],
+        "updated_at": row[offset + 6],
+    }
+
+
+def _product_columns(product=Product, category=Category):
+    return (
+        *(getattr(product, column.key) for column in PRODUCT_COLUMNS),
+        product.created_at,
+        product.updated_at,
+        *(getattr(category, column.key) for column in CATEGORY_COLUMNS),
+    )
+
+
+def category_rows(db: Session) -> list[dict]:
+    rows = db.execute(
+        select(*CATEGORY_COLUMNS)
+        .where(Category.is_deleted == False)
+        .order_by(Category.id)
+    )
+    return [_category(row, 0) for row in rows]
+
+
+def product_rows(db: Session) -> list[dict]:
+    rows = db.execute(
+        select(*_product_columns())
+        .outerjoin(Category, Product.category_id == Category.id)
+        .where(Product.is_deleted == False)
+        .order_by(Product.id)
+    )
+    return [_product(row, 0) for row in rows]
+
+
+def inventory_rows(db: Session) -> list[dict]:
+    product = aliased(Product)
+    category = aliased(Category)
+    rows = db.execute(
+        select(
+            Inventory.product_id,
+            Inventory.stock,
+            Inventory.id,
+            Inventory.created_at,
+            Inventory.updated_at,
+            *_product_columns(product, category),
+        )
+        .outerjoin(product, Inventory.product_id == product.id)
+        .outerjoin(category, product.category_id == category.id)
+        .where(Inventory.is_deleted == False)
+        .order_by(Inventory.id)
+    )
+    return [
+        {
+            "product_id": row[0],
+            "stock": row[1],
+            "id": row[2],
+            "product": _product(row, 5),
+            "created_at": row[3],
+            "updated_at": row[4],
+        }
+        for row in rows
+    ]
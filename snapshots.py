@@ -0,0 +1,310 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.orm import Session, aliased, sessionmaker
+
+import partitions
+from config import STOCK_SNAPSHOT_RETENTION_DAYS
+from database import make_engine
+from models import Inventory, InventoryLog, StockSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Inventory ids start at 1, so a day checkpointed before any item existed is
+# marked by a row for id 0; as-of requests can then replay from it.
+EMPTY_CHECKPOINT = 0
+
+# A checkpoint reads the live stock and the logs written since midnight, so it
+# holds the write lock to see both in the same state.
+SnapshotSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=make_engine(begin_immediate=True)
+)
+
+
+def _start(day: date) -> datetime:
+    return datetime.combine(day, time())
+
+
+def _changes(
+    db: Session,
+    condition,
+    start: datetime,
+    end: datetime | None = None,
+    *,
+    newest_first=False,
+):
+    """Inventory log entries matching ``condition(columns)``, oldest first.
+
+    ``start`` and ``end`` only pick the sealed months to read; ``condition``
+    has to bound ``change_date`` itself.
+    """
+
+    def build(logs):
+        return select(
+            logs.inventory_id, logs.old_stock, logs.new_stock, logs.change_date, logs.id
+        ).where(condition(logs))
+
+    statement = partitions.union(partitions.tables(db, InventoryLog, start, end), build)
+    order = [statement.selected_columns.change_date, statement.selected_columns.id]
+    if newest_first:
+        order = [column.desc() for column in order]
+    return db.execute(statement.order_by(*order)).all()
+
+
+def _first_changes(
+    db: Session, inventory_ids, after: datetime, before: datetime | None
+):
+    """Each item's first log entry after ``after`` and before ``before``, by
+    inventory id."""
+
+    def build(logs):
+        condition = logs.inventory_id.in_(inventory_ids) & (logs.change_date > after)
+        if before is not None:
+            condition &= logs.change_date < before
+        ranked = (
+            select(
+                logs.inventory_id,
+                logs.old_stock,
+                logs.change_date,
+                logs.id,
+                func.row_number()
+                .over(
+                    partition_by=logs.inventory_id,
+                    order_by=(logs.change_date, logs.id),
+                )
+                .label("position"),
+            )
+            .where(condition)
+            .subquery()
+        )
+        return select(
+            ranked.c.inventory_id,
+            ranked.c.old_stock,
+            ranked.c.change_date,
+            ranked.c.id,
+        ).where(ranked.c.position == 1)
+
+    statement = partitions.union(
+        partitions.tables(db, InventoryLog, after, before), build
+    )
+    first = {}
+    # A sealed month's late rows sit in the main table, so an item can have a
+    # first entry in more than one table.
+    for inventory_id, old_stock, change_date, log_id in db.execute(statement):
+        earliest = first.get(inventory_id)
+        if earliest is None or (change_date, log_id) < earliest[1:]:
+            first[inventory_id] = (old_stock, change_date, log_id)
+    return {inventory_id: entry[0] for inventory_id, entry in first.items()}
+
+
+def write(db: Session, day: date) -> int:
+    """Checkpoint the stock of every inventory item created by ``day`` as
+    it stood at the start of ``day``, replacing any earlier checkpoint of it.
+
+    Starts from the next checkpoint after ``day``, or from the live stock when
+    there is none, and undoes the logged changes in between. Returns the items
+    checkpointed.
+    """
+    start = _start(day)
+    later = db.scalar(
+        select(func.min(StockSnapshot.snapshot_date)).where(
+            StockSnapshot.snapshot_date > day
+        )
+    )
+    if later is None:
+        query, end = select(Inventory.id, Inventory.stock), None
+    else:
+        query = select(Inventory.id, StockSnapshot.stock).join(
+            StockSnapshot,
+            and_(
+                StockSnapshot.inventory_id == Inventory.id,
+                StockSnapshot.snapshot_date == later,
+            ),
+        )
+        end = _start(later)
+    stock = dict(db.execute(query.where(Inventory.created_at <= start)).all())
+
+    def since_start(logs):
+        if end is None:
+            return logs.change_date >= start
+        return (logs.change_date >= start) & (logs.change_date < end)
+
+    for inventory_id, old_stock, *_ in _changes(
+        db, since_start, start, end, newest_first=True
+    ):
+        if inventory_id in stock:
+            stock[inventory_id] = old_stock
+
+    db.execute(delete(StockSnapshot).where(StockSnapshot.snapshot_date == day))
+    db.connection().execute(
+        insert(StockSnapshot),
+        [
+            {"snapshot_date": day, "inventory_id": inventory_id, "stock": level}
+            for inventory_id, level in stock.items()
+        ]
+        or [{"snapshot_date": day, "inventory_id": EMPTY_CHECKPOINT, "stock": None}],
+    )
+    db.commit()
+    return len(stock)
+
+
+def write_missing(db: Session, until: date, since: date | None = None) -> dict:
+    """Write the checkpoints missing from ``since``..``until``, newest first so
+    each one rewinds from the one after it.
+
+    ``since`` defaults to the day after the latest checkpoint, or to ``until``
+    when there is none. Returns the rows written per day.
+    """
+    if since is None:
+        latest = db.scalar(
+            select(func.max(StockSnapshot.snapshot_date)).where(
+                StockSnapshot.snapshot_date <= until
+            )
+        )
+        since = latest + timedelta(days=1) if latest else until
+    existing = set(
+        db.scalars(
+            select(StockSnapshot.snapshot_date)
+            .where(StockSnapshot.snapshot_date.between(since, until))
+            .distinct()
+        )
+    )
+    written = {}
+    day = until
+    while day >= since:
+        if day not in existing:
+            written[day] = write(db, day)
+        day -= timedelta(days=1)
+    return written
+
+
+def prune(db: Session, before: date) -> dict:
+    """Delete the checkpoints of the days before ``before``, one day per
+    transaction. Returns the rows deleted per day."""
+    days = db.scalars(
+        select(StockSnapshot.snapshot_date)
+        .where(StockSnapshot.snapshot_date < before)
+        .distinct()
+        .order_by(StockSnapshot.snapshot_date)
+    ).all()
+    deleted = {}
+    for day in days:
+        deleted[day] = db.execute(
+            delete(StockSnapshot).where(StockSnapshot.snapshot_date == day)
+        ).rowcount
+        db.commit()
+    return deleted
+
+
+def stock_as_of(db: Session, when: datetime) -> tuple[date, list[dict]] | None:
+    """The stock of every live inventory item created by ``when``, as it stood
+    then, and the checkpoint it was replayed from.
+
+    Only the log entries between the nearest checkpoints before and after
+    ``when`` are read. None when there is no checkpoint at or before ``when``.
+    """
+    checkpoint, following = db.execute(
+        select(
+            select(func.max(StockSnapshot.snapshot_date))
+            .where(StockSnapshot.snapshot_date <= when.date())
+            .scalar_subquery(),
+            select(func.min(StockSnapshot.snapshot_date))
+            .where(StockSnapshot.snapshot_date > when.date())
+            .scalar_subquery(),
+        )
+    ).one()
+    if checkpoint is None:
+        return None
+    start = _start(checkpoint)
+    next_snapshot = aliased(StockSnapshot)
+    items = db.execute(
+        select(
+            Inventory.id,
+            Inventory.product_id,
+            Inventory.stock,
+            StockSnapshot.inventory_id.label("checkpointed"),
+            StockSnapshot.stock.label("checkpoint_stock"),
+            next_snapshot.inventory_id.label("next_checkpointed"),
+            next_snapshot.stock.label("next_checkpoint_stock"),
+        )
+        .outerjoin(
+            StockSnapshot,
+            and_(
+                StockSnapshot.inventory_id == Inventory.id,
+                StockSnapshot.snapshot_date == checkpoint,
+            ),
+        )
+        .outerjoin(
+            next_snapshot,
+            and_(
+                next_snapshot.inventory_id == Inventory.id,
+                next_snapshot.snapshot_date == following,
+            ),
+        )
+        .where(Inventory.is_deleted == False, Inventory.created_at <= when)
+        .order_by(Inventory.id)
+    ).all()
+    stock = {
+        item.id: item.checkpoint_stock
+        for item in items
+        if item.checkpointed is not None
+    }
+    for inventory_id, _, new_stock, *_ in _changes(
+        db,
+        lambda logs: (logs.change_date >= start) & (logs.change_date <= when),
+        start,
+        when,
+    ):
+        stock[inventory_id] = new_stock
+
+    # Items created since the checkpoint and untouched until ``when`` still
+    # held their initial stock: the level before their next change, else the
+    # one in the following checkpoint, else the current one.
+    unchanged = {
+        item.id: (
+            item.next_checkpoint_stock
+            if item.next_checkpointed is not None
+            else item.stock
+        )
+        for item in items
+        if item.id not in stock
+    }
+    if unchanged:
+        end = _start(following) if following else None
+        unchanged.update(_first_changes(db, list(unchanged), when, end))
+        stock.update(unchanged)
+
+    return checkpoint, [
+        {"id": item.id, "product_id": item.product_id, "stock": stock[item.id]}
+        for item in items
+    ]
+
+
+def _write_due() -> dict:
+    db = SnapshotSessionLocal()
+    try:
+        today = datetime.utcnow().date()
+        written = write_missing(db, today)
+        if STOCK_SNAPSHOT_RETENTION_DAYS:
+            prune(db, today - timedelta(days=STOCK_SNAPSHOT_RETENTION_DAYS))
+        return written
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_daily():
+    """Write today's checkpoint, and any missed since the last one, and prune
+    those past retention, now and after every UTC midnight."""
+    while True:
+        try:
+            await asyncio.to_thread(_write_due)
+        except Exception:
+            logger.exception("Writing the stock checkpoint failed")
+        now = datetime.utcnow()
+        midnight = _start(now.date() + timedelta(days=1))
+        await asyncio.sleep((midnight - now).total_seconds())
@@ -0,0 +1,93 @@
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from database import ReadSessionLocal
+from enums import ExportFormat
+
+STREAM_BATCH_SIZE = 1000
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def dumps(row: dict) -> str:
+    return orjson.dumps(row, default=_default).decode()
+
+
+def iter_row_batches(statement: Select, batch_size: int = STREAM_BATCH_SIZE):
+    # The request session is closed before a StreamingResponse body runs, so
+    # the stream owns its session for as long as the client keeps reading.
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.mappings().partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def json_array(statement: Select, batch_size: int = STREAM_BATCH_SIZE):
+    yield "["
+    separator = ""
+    for partition in iter_row_batches(statement, batch_size):
+        yield separator + ",".join(dumps(dict(row)) for row in partition)
+        separator = ","
+    yield "]"
+
+
+def ndjson_lines(statement: Select, batch_size: int = STREAM_BATCH_SIZE):
+    for partition in iter_row_batches(statement, batch_size):
+        yield "".join(dumps(dict(row)) + "\n" for row in partition)
+
+
+def csv_lines(statement: Select, batch_size: int = STREAM_BATCH_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.name for column in statement.selected_columns)
+    yield buffer.getvalue()
+    for partition in iter_row_batches(statement, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [_csv_value(value) for value in row.values()] for row in partition
+        )
+        yield buffer.getvalue()
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def export_response(statement: Select, export_format: ExportFormat, name: str):
+    filename = f"{name}.{export_format.value}"
+    body = (
+        csv_lines(statement)
+        if export_format == ExportFormat.CSV
+        else ndjson_lines(statement)
+    )
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )